@@ -0,0 +1,182 @@
+"""
+Нагрузочное сравнение синхронных и асинхронных страниц.
+
+Каждая страница прогоняется тремя способами при заданном числе
+одновременных соединений:
+
+* wsgi — синхронное представление под WSGI, пул потоков, как у
+  многопоточного WSGI-сервера;
+* asgi-sync — синхронное представление под ASGI: Django переводит
+  каждый запрос в поток;
+* asgi-async — асинхронный вариант представления под ASGI.
+
+ASGI-приложение вызывается напрямую из цикла событий, без сети, и служит
+локальной заменой uvicorn/daphne; так сравнивается сам Django, а не
+сервер. Замеры идут в профиле yanews.settings.bench на отдельной
+базе bench.sqlite3. Сначала заполните её:
+
+    export DJANGO_SETTINGS_MODULE=yanews.settings.bench
+    python manage.py migrate
+    python manage.py seed_news --count 10000
+
+Затем из каталога ya_news:
+
+    python -m benchmarks.async_views --concurrency 128 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import django
+
+HOST = 'localhost'
+
+
+def percentile(timings, share):
+    return timings[min(int(len(timings) * share), len(timings) - 1)]
+
+
+def report(name, timings, elapsed):
+    timings.sort()
+    print(f'{name:<28} {len(timings) / elapsed:>9.1f} '
+          f'{statistics.median(timings) * 1000:>9.2f} '
+          f'{percentile(timings, 0.99) * 1000:>9.2f}')
+
+
+def wsgi_environ(path, query):
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': HOST,
+        'SERVER_PORT': '80',
+        'HTTP_HOST': HOST,
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(),
+        'wsgi.errors': BytesIO(),
+    }
+
+
+def run_wsgi(application, path, query, concurrency, total):
+    def request(_):
+        statuses = []
+        started = time.perf_counter()
+        body = application(
+            wsgi_environ(path, query),
+            lambda status, headers: statuses.append(status),
+        )
+        b''.join(body)
+        body.close()
+        assert statuses[0].startswith('200'), statuses[0]
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = list(pool.map(request, range(total)))
+    return timings, time.perf_counter() - started
+
+
+async def asgi_request(application, path, query):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', HOST.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': (HOST, 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    assert messages[0]['status'] == 200, messages[0]['status']
+    return time.perf_counter() - started
+
+
+async def run_asgi(application, path, query, concurrency, total):
+    remaining = iter(range(total))
+    timings = []
+
+    async def connection():
+        for _ in remaining:
+            timings.append(await asgi_request(application, path, query))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(concurrency)))
+    return timings, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--concurrency', type=int, default=128)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument(
+        '--cached', action='store_true',
+        help='отдавать анонимную страницу новости из кеша'
+    )
+    options = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings.bench')
+    django.setup()
+    from django.conf import settings
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from django.urls import reverse
+
+    from news.models import News
+
+    settings.DEBUG = False
+    news = News.objects.first()
+    if news is None:
+        raise SystemExit('База пуста: запустите manage.py seed_news.')
+    # Любой GET-параметр отключает кеш анонимной страницы новости.
+    query = '' if options.cached else 'nocache=1'
+    pages = (
+        ('главная', 'news:home', 'news:home_async', ()),
+        ('новость', 'news:detail', 'news:detail_async', (news.pk,)),
+    )
+    wsgi = get_wsgi_application()
+    asgi = get_asgi_application()
+    print(f'Соединений: {options.concurrency}, '
+          f'запросов на прогон: {options.requests}')
+    print(f'{"прогон":<28} {"запр./с":>9} {"p50, мс":>9} {"p99, мс":>9}')
+    for title, sync_name, async_name, args in pages:
+        sync_path = reverse(sync_name, args=args)
+        async_path = reverse(async_name, args=args)
+        runs = (
+            ('wsgi', lambda: run_wsgi(
+                wsgi, sync_path, query,
+                options.concurrency, options.requests,
+            )),
+            ('asgi-sync', lambda: asyncio.run(run_asgi(
+                asgi, sync_path, query,
+                options.concurrency, options.requests,
+            ))),
+            ('asgi-async', lambda: asyncio.run(run_asgi(
+                asgi, async_path, query,
+                options.concurrency, options.requests,
+            ))),
+        )
+        for mode, run in runs:
+            report(f'{title}, {mode}', *run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Замер поиска по архиву новостей.
+
+Замер идёт в профиле yanews.settings.bench на отдельной базе
+bench.sqlite3. Сначала заполните её, например миллионом новостей:
+
+    export DJANGO_SETTINGS_MODULE=yanews.settings.bench
+    python manage.py migrate
+    python manage.py seed_news --count 1000000
+
+Затем из каталога ya_news:
+
+    python -m benchmarks.news_search
+"""
+import os
+import statistics
+import time
+
+import django
+
+# От самого частого слова сида к редким: время растёт с числом совпадений,
+# которые нужно ранжировать по bm25.
+QUERIES = ('город', 'ракета', 'библиотека', 'футбол рекорд', 'теат',
+           'несуществующееслово')
+REPEAT = 20
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings.bench')
+    django.setup()
+    from news.models import News
+    from news.search import search_news
+
+    print(f'Новостей в базе: {News.objects.count()}')
+    print(f'{"запрос":<22} {"медиана, мс":>12} {"p95, мс":>9}')
+    for query in QUERIES:
+        timings = []
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            search_news(News.objects.all(), query, 0, 21)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f'{query:<22} {statistics.median(timings):>12.2f} {p95:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
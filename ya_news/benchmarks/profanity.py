@@ -0,0 +1,57 @@
+"""
+Сравнение проверки комментариев на плохие слова.
+
+Наивный способ проверяет каждое слово подстрокой, автомат
+Ахо — Корасик проходит текст один раз. Запуск из каталога ya_news:
+
+    python -m benchmarks.profanity
+"""
+import random
+import timeit
+
+from news.profanity import WordMatcher
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+WORD_COUNTS = (10, 1_000, 10_000)
+TEXT_LENGTHS = (1_000, 10_000)
+REPEAT = 5
+
+
+def random_word(rng, length):
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def naive_search(words, text):
+    lowered_text = text.lower()
+    for word in words:
+        if word in lowered_text:
+            return True
+    return False
+
+
+def best_time(func, number):
+    return min(timeit.repeat(func, number=number, repeat=REPEAT)) / number
+
+
+def main():
+    rng = random.Random(0)
+    print(f'{"слов":>7} {"символов":>9} {"наивно, мс":>11} '
+          f'{"автомат, мс":>12} {"ускорение":>10}')
+    for word_count in WORD_COUNTS:
+        # Слова длиннее 8 букв почти не встречаются в случайном тексте,
+        # поэтому обе проверки проходят текст целиком — худший случай.
+        words = [random_word(rng, 9) for _ in range(word_count)]
+        matcher = WordMatcher(words)
+        for text_length in TEXT_LENGTHS:
+            text = ' '.join(
+                random_word(rng, 6) for _ in range(text_length // 7)
+            )
+            assert naive_search(words, text) == matcher.search(text)
+            naive = best_time(lambda: naive_search(words, text), 3)
+            automaton = best_time(lambda: matcher.search(text), 3)
+            print(f'{word_count:>7} {text_length:>9} {naive * 1000:>11.3f} '
+                  f'{automaton * 1000:>12.3f} {naive / automaton:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
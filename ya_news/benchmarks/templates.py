@@ -0,0 +1,106 @@
+"""
+Время отрисовки news/home.html с кешем шаблонов и без него.
+
+Без кеша, как в профиле yanews.settings.dev, шаблон, его родитель
+и включения читаются с диска и разбираются при каждой отрисовке.
+С кеширующим загрузчиком, как в yanews.settings.prod, это происходит
+один раз. База не нужна: новости создаются в памяти, фрагмент
+{% cache %} не сохраняется (таймаут 0), так что каждый раз
+отрисовывается весь список. Из каталога ya_news:
+
+    python -m benchmarks.templates --renders 2000
+"""
+import argparse
+import os
+import statistics
+import time
+from datetime import date
+
+import django
+
+TEMPLATE = 'news/home.html'
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def percentile(timings, share):
+    return timings[min(int(len(timings) * share), len(timings) - 1)]
+
+
+def report(name, timings):
+    timings.sort()
+    print(f'{name:<24} {statistics.mean(timings) * 1e6:>9.1f} '
+          f'{statistics.median(timings) * 1e6:>9.1f} '
+          f'{percentile(timings, 0.99) * 1e6:>9.1f}')
+
+
+def make_engine(name, loaders):
+    """Движок с параметрами из TEMPLATES и заданными загрузчиками."""
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    params = settings.TEMPLATES[0]
+    return DjangoTemplates({
+        'NAME': name,
+        'DIRS': params['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {**params['OPTIONS'], 'loaders': loaders},
+    }).engine
+
+
+def run(engine, context, renders):
+    from django.template import Context
+
+    timings = []
+    for _ in range(renders):
+        started = time.perf_counter()
+        engine.get_template(TEMPLATE).render(Context(context))
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--renders', type=int, default=2000)
+    options = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings.bench')
+    django.setup()
+    from django.conf import settings
+    from django.contrib.auth.models import AnonymousUser
+
+    from news.models import News, NewsRanking
+
+    engines = (
+        ('без кеша', make_engine('plain', LOADERS)),
+        ('кеширующий загрузчик', make_engine(
+            'cached', [('django.template.loaders.cached.Loader', LOADERS)]
+        )),
+    )
+    context = {
+        'object_list': [
+            News(
+                pk=number, title=f'Новость {number}',
+                excerpt='Начало новости ' * 5, date=date.today(),
+                comment_count=number,
+            )
+            for number in range(1, settings.NEWS_COUNT_ON_HOME_PAGE + 1)
+        ],
+        'user': AnonymousUser(),
+        'feeds': NewsRanking.Feed,
+        'cache_alias': settings.NEWS_CACHE_ALIAS,
+        'cache_timeout': 0,
+        'cache_version': 0,
+    }
+    print(f'Шаблон {TEMPLATE}, отрисовок: {options.renders}')
+    print(f'{"загрузка":<24} {"сред., мкс":>9} {"p50, мкс":>9} '
+          f'{"p99, мкс":>9}')
+    for name, engine in engines:
+        run(engine, context, 10)
+        report(name, run(engine, context, options.renders))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+JSON API для чтения новостей и комментариев.
+
+Записи читаются через values() без создания объектов моделей,
+страницы листаются по ключу, как и HTML-страницы, а параметр fields
+задаёт набор полей ответа. Ответ собирается потоком по мере чтения
+строк из базы, поэтому большая страница комментариев не копится
+в памяти. Каждый ответ стоит фиксированного числа запросов.
+
+Формат ответа: {"results": [...], "next": адрес следующей страницы
+или null}. Ошибки параметров возвращаются как {"error": "..."}.
+"""
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import generic
+
+from .models import Comment, News
+from .pagination import InvalidCursor, KeysetPaginator
+
+
+class ApiError(Exception):
+    """Ошибка запроса к API с кодом ответа."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def dumps(value):
+    return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+class ApiListView(generic.View):
+    """
+    Базовый класс списка в API.
+
+    В наследнике задаются поля (имя в ответе → путь поля для values()),
+    поля по умолчанию, порядок ключа и get_queryset().
+    """
+    http_method_names = ['get', 'head', 'options']
+    fields = {}
+    default_fields = ()
+    ordering = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({'error': error.message}, status=error.status)
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_fields(self):
+        """Поля ответа из параметра fields."""
+        value = self.request.GET.get('fields')
+        if not value:
+            return self.default_fields
+        names = tuple(dict.fromkeys(value.split(',')))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ApiError(f'Неизвестные поля: {", ".join(unknown)}.')
+        return names
+
+    def get_limit(self):
+        """Размер страницы из параметра limit."""
+        value = self.request.GET.get('limit')
+        if value is None:
+            return settings.API_PAGE_SIZE
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = None
+        if limit is None or not 1 <= limit <= self.max_limit:
+            raise ApiError(f'limit должен быть от 1 до {self.max_limit}.')
+        return limit
+
+    @property
+    def max_limit(self):
+        return settings.API_MAX_PAGE_SIZE
+
+    def next_url(self, cursor):
+        query = self.request.GET.copy()
+        query['cursor'] = cursor
+        return f'{self.request.path}?{query.urlencode()}'
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        keys = [field.lstrip('-') for field in self.ordering]
+        columns = dict.fromkeys(
+            [self.fields[name] for name in fields] + keys
+        )
+        paginator = KeysetPaginator(
+            self.get_queryset().values(*columns),
+            ordering=self.ordering,
+            per_page=self.get_limit(),
+        )
+        try:
+            rows = paginator.rows(request.GET.get('cursor'))
+        except InvalidCursor:
+            raise ApiError('Некорректный курсор.')
+        return StreamingHttpResponse(
+            self.stream(rows, fields, paginator),
+            content_type='application/json',
+        )
+
+    def stream(self, rows, fields, paginator):
+        """Части JSON-ответа по мере чтения строк."""
+        yield '{"results": ['
+        last = None
+        for index, row in enumerate(
+            rows.iterator(settings.API_CHUNK_SIZE)
+        ):
+            if index == paginator.per_page:
+                next_url = self.next_url(paginator.cursor_for(last))
+                yield f'], "next": {dumps(next_url)}}}'
+                return
+            separator = ', ' if index else ''
+            yield separator + dumps(
+                {name: row[self.fields[name]] for name in fields}
+            )
+            last = row
+        yield '], "next": null}'
+
+
+class NewsListApi(ApiListView):
+    """Новости от свежих к старым."""
+    fields = {
+        'id': 'id',
+        'title': 'title',
+        'date': 'date',
+        'excerpt': 'excerpt',
+        'text': 'text',
+        'comment_count': 'comment_count',
+    }
+    default_fields = ('id', 'title', 'date', 'excerpt', 'comment_count')
+    ordering = ('-date', '-id')
+
+    def get_queryset(self):
+        return News.objects.all()
+
+
+class CommentListApi(ApiListView):
+    """Комментарии к новости в порядке добавления."""
+    fields = {
+        'id': 'id',
+        'text': 'text',
+        'created': 'created',
+        'author': 'author__username',
+    }
+    default_fields = ('id', 'author', 'text', 'created')
+    ordering = ('created', 'id')
+
+    @property
+    def max_limit(self):
+        return settings.API_MAX_COMMENTS_PAGE_SIZE
+
+    def get(self, request, *args, **kwargs):
+        if not News.objects.filter(pk=self.kwargs['pk']).exists():
+            raise ApiError('Новость не найдена.', status=404)
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        return Comment.objects.filter(news_id=self.kwargs['pk'])
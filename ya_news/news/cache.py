@@ -0,0 +1,82 @@
+"""
+Кеш отрисованных страниц.
+
+Ключ страницы включает версию: время последнего изменения данных
+в наносекундах. При изменении версия увеличивается, и старые записи
+просто перестают запрашиваться (удалять их не нужно, они вытесняются
+по таймауту). Версия не бывает раньше изменения, поэтому подходит
+и для Last-Modified. Бэкенд выбирается
+настройкой NEWS_CACHE_ALIAS из CACHES, так что подходят и локальная
+память, и файловый кеш, и любой другой бэкенд Django.
+"""
+from time import time_ns
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def get_cache():
+    return caches[settings.NEWS_CACHE_ALIAS]
+
+
+def _version_key(name):
+    return f'news:version:{name}'
+
+
+def get_version(name):
+    """Текущая версия набора данных name."""
+    cache = get_cache()
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        # Начинаем с текущего времени: если счётчик был вытеснен,
+        # новая версия не совпадёт ни с одной из прежних.
+        version = time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(name):
+    """
+    Делает недействительными все страницы набора данных name.
+
+    Новая версия — текущее время, но не меньше прежней версии плюс один,
+    даже если часы процессов расходятся.
+    """
+    cache = get_cache()
+    key = _version_key(name)
+    version = cache.get(key, 0)
+    cache.set(key, max(time_ns(), version + 1), timeout=None)
+
+
+def detail_page_version(news_pk):
+    return get_version(f'detail:{news_pk}')
+
+
+def version_timestamp(version):
+    """Время версии в секундах, как в заголовке Last-Modified."""
+    return version // 10 ** 9
+
+
+def detail_page_key(news_pk):
+    return f'news:page:detail:{news_pk}:{detail_page_version(news_pk)}'
+
+
+def invalidate_detail_page(news_pk):
+    bump_version(f'detail:{news_pk}')
+
+
+def home_page_version():
+    return get_version('home')
+
+
+def invalidate_home_page():
+    bump_version('home')
+
+
+def invalidate_news_pages(*news_pks):
+    """Сбрасывает главную и страницы новостей news_pks."""
+    invalidate_home_page()
+    for news_pk in news_pks:
+        invalidate_detail_page(news_pk)
@@ -0,0 +1,77 @@
+"""
+Условные GET-запросы к странице новости.
+
+Читатели опрашивают новость в ожидании комментариев и присылают
+If-None-Match или If-Modified-Since. Валидаторы страницы читаются
+одним запросом: дата новости, число комментариев и время последнего
+комментария по индексу comment_news_created_idx. Сама новость
+и комментарии не загружаются, шаблон не отрисовывается. В ETag
+входит версия кеша страницы, которую сигналы увеличивают при любой
+правке новости или комментария, и пользователь: разметка у каждого
+своя. Версия — время последней правки, поэтому она входит
+и в Last-Modified: иначе правка новости, правка или удаление
+комментария не меняли бы его, и клиент с одним If-Modified-Since
+получал бы 304 на устаревшую страницу.
+"""
+import hashlib
+from datetime import datetime, time
+
+from django.db.models import OuterRef, Subquery
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from . import cache
+from .models import Comment, News
+
+
+def page_validators(news_pk, user_pk=None, query=''):
+    """
+    Валидаторы страницы новости: ETag и метка времени Last-Modified.
+
+    Если новости нет, возвращает None.
+    """
+    last_comment = Comment.objects.filter(
+        news=OuterRef('pk')
+    ).order_by('-created').values('created')[:1]
+    row = News.objects.filter(pk=news_pk).annotate(
+        last_comment=Subquery(last_comment)
+    ).values_list('date', 'comment_count', 'last_comment').first()
+    if row is None:
+        return None
+    date, comment_count, last_comment = row
+    # Дата новости — дата в часовом поясе сайта, а не в UTC: иначе
+    # сегодняшняя новость в поясе восточнее UTC получала бы
+    # Last-Modified в будущем.
+    last_modified = timezone.make_aware(datetime.combine(date, time.min))
+    if last_comment is not None:
+        last_modified = max(last_modified, last_comment)
+    version = cache.detail_page_version(news_pk)
+    last_modified = max(
+        int(last_modified.timestamp()), cache.version_timestamp(version)
+    )
+    raw = f'{news_pk}:{version}:{user_pk}:{comment_count}:{last_modified}:'
+    etag = quote_etag(hashlib.md5((raw + query).encode()).hexdigest())
+    return etag, last_modified
+
+
+def not_modified(request, etag, last_modified):
+    """Ответ 304, если у клиента актуальная страница, иначе None."""
+    return get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def cached_response(request, content, etag, last_modified):
+    """Ответ по странице из кеша, сохранённой вместе с валидаторами."""
+    response = not_modified(request, etag, last_modified)
+    if response is None:
+        response = HttpResponse(content)
+    return set_validators(response, etag, last_modified)
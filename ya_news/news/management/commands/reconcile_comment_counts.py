@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = (
+        'Сверяет счётчики комментариев новостей с числом комментариев '
+        'и исправляет расхождения. Новости обходятся пачками по id, '
+        'каждая пачка исправляется одним UPDATE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, batch_size, **options):
+        ids = News.objects.order_by('pk').values_list('pk', flat=True)
+        last = 0
+        fixed = 0
+        while True:
+            batch = list(ids.filter(pk__gt=last)[:batch_size])
+            if not batch:
+                break
+            fixed += News.objects.filter(
+                pk__gte=batch[0], pk__lte=batch[-1]
+            ).reconcile_comment_counts()
+            last = batch[-1]
+        self.stdout.write(f'Исправлено счётчиков: {fixed}')
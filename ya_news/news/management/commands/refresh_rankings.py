@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from news.models import NewsRanking
+from news.rankings import refresh_feed
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает ленты обсуждаемых новостей. Запускается '
+        'по расписанию, например раз в минуту; неизменившиеся ленты '
+        'не перезаписываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--feed', action='append', choices=NewsRanking.Feed.values,
+            help='пересчитать только эту ленту (можно указать несколько)'
+        )
+        parser.add_argument(
+            '--size', type=int, default=settings.NEWS_RANKING_SIZE
+        )
+
+    def handle(self, *args, feed, size, **options):
+        now = timezone.now()
+        for name in feed or NewsRanking.Feed.values:
+            changed = refresh_feed(name, size, now)
+            status = 'обновлена' if changed else 'без изменений'
+            self.stdout.write(f'Лента {name}: {status}')
@@ -0,0 +1,69 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from news.models import News
+
+WORDS = (
+    'город', 'погода', 'выборы', 'футбол', 'экономика', 'рынок', 'курс',
+    'наука', 'космос', 'ракета', 'музей', 'выставка', 'театр', 'премьера',
+    'дорога', 'метро', 'мост', 'школа', 'университет', 'больница',
+    'фестиваль', 'концерт', 'турнир', 'чемпионат', 'рекорд', 'закон',
+    'бюджет', 'налог', 'зарплата', 'пенсия', 'урожай', 'лес', 'река',
+    'пожар', 'дождь', 'снег', 'жара', 'ветер', 'парк', 'библиотека',
+)
+SYLLABLES = ('ка', 'ло', 'ми', 'ра', 'то', 'ну', 'се', 'ви', 'до', 'жа')
+TAIL_SIZE = 10_000
+
+
+def vocabulary(rng):
+    """
+    Словарь с частотами по закону Ципфа.
+
+    Частые слова встречаются почти в каждой новости, редкие — в единицах,
+    как в настоящем архиве.
+    """
+    tail = {
+        ''.join(rng.choices(SYLLABLES, k=rng.randint(3, 5)))
+        for _ in range(TAIL_SIZE)
+    }
+    words = list(WORDS) + sorted(tail - set(WORDS))
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    return words, weights
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу случайными новостями для нагрузочных замеров. '
+        'Данные воспроизводимы: при одинаковом --seed получаются те же строки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--days', type=int, default=3650)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, count, batch_size, days, seed, **options):
+        rng = random.Random(seed)
+        words, weights = vocabulary(rng)
+        today = timezone.now().date()
+        created = 0
+        while created < count:
+            size = min(batch_size, count - created)
+            with transaction.atomic():
+                News.objects.bulk_create(
+                    News(
+                        title=' '.join(
+                            rng.choices(words, weights, k=4)
+                        ).capitalize(),
+                        text=' '.join(rng.choices(words, weights, k=120)),
+                        date=today - timedelta(days=rng.randrange(days)),
+                    )
+                    for _ in range(size)
+                )
+            created += size
+            self.stdout.write(f'Создано новостей: {created}/{count}')
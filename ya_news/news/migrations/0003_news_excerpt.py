@@ -0,0 +1,35 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:09
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+BATCH_SIZE = 1000
+
+
+def fill_excerpts(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    objects = News.objects.using(schema_editor.connection.alias)
+    batch = []
+    for news in objects.only('id', 'text').iterator(BATCH_SIZE):
+        news.excerpt = Truncator(news.text).words(15, truncate=' …')
+        batch.append(news)
+        if len(batch) == BATCH_SIZE:
+            objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
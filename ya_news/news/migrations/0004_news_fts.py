@@ -0,0 +1,61 @@
+from django.db import migrations
+
+CREATE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS news_news_fts USING fts5("
+    "title, text, content='news_news', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    # Совпадения в заголовке весят больше, чем в тексте.
+    "INSERT INTO news_news_fts (news_news_fts, rank) "
+    "VALUES ('rank', 'bm25(10.0, 1.0)')",
+    """CREATE TRIGGER IF NOT EXISTS news_news_fts_insert
+    AFTER INSERT ON news_news BEGIN
+        INSERT INTO news_news_fts (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_news_fts_delete
+    AFTER DELETE ON news_news BEGIN
+        INSERT INTO news_news_fts (news_news_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_news_fts_update
+    AFTER UPDATE OF title, text ON news_news BEGIN
+        INSERT INTO news_news_fts (news_news_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO news_news_fts (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END""",
+    "INSERT INTO news_news_fts (news_news_fts) VALUES ('rebuild')",
+)
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS news_news_fts_insert',
+    'DROP TRIGGER IF EXISTS news_news_fts_delete',
+    'DROP TRIGGER IF EXISTS news_news_fts_update',
+    'DROP TABLE IF EXISTS news_news_fts',
+)
+
+
+def run_sql(schema_editor, statements):
+    """FTS5 есть только в SQLite, на других СУБД поиск идёт по icontains."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_fts(apps, schema_editor):
+    run_sql(schema_editor, CREATE_SQL)
+
+
+def drop_fts(apps, schema_editor):
+    run_sql(schema_editor, DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_news_excerpt'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
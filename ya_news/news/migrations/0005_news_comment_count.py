@@ -0,0 +1,75 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+# Триггеры поиска в том виде, в каком их создала 0004_news_fts.
+CREATE_TRIGGERS_SQL = (
+    """CREATE TRIGGER IF NOT EXISTS news_news_fts_insert
+    AFTER INSERT ON news_news BEGIN
+        INSERT INTO news_news_fts (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_news_fts_delete
+    AFTER DELETE ON news_news BEGIN
+        INSERT INTO news_news_fts (news_news_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS news_news_fts_update
+    AFTER UPDATE OF title, text ON news_news BEGIN
+        INSERT INTO news_news_fts (news_news_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO news_news_fts (rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END""",
+)
+
+
+def create_triggers(apps, schema_editor):
+    """Пересоздание таблицы на SQLite удаляет триггеры поиска."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_TRIGGERS_SQL:
+        schema_editor.execute(statement)
+
+
+def fill_comment_counts(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    Comment = apps.get_model('news', 'Comment')
+    objects = News.objects.using(schema_editor.connection.alias)
+    actual = Coalesce(Subquery(
+        Comment.objects.filter(
+            news=OuterRef('pk')
+        ).order_by().values('news').annotate(
+            count=Count('pk')
+        ).values('count')
+    ), 0)
+    ids = objects.order_by('pk').values_list('pk', flat=True)
+    last = 0
+    while True:
+        batch = list(ids.filter(pk__gt=last)[:BATCH_SIZE])
+        if not batch:
+            break
+        objects.filter(
+            pk__gte=batch[0], pk__lte=batch[-1]
+        ).update(comment_count=actual)
+        last = batch[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_news_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, create_triggers),
+        migrations.AddField(
+            model_name='news',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(create_triggers, migrations.RunPython.noop),
+        migrations.RunPython(fill_comment_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.15 on 2026-10-18 19:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_news_comment_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feed', models.CharField(choices=[('hour', 'Обсуждают за час'), ('day', 'Обсуждают за сутки'), ('week', 'Обсуждают за неделю'), ('discussed', 'Самые обсуждаемые')], max_length=16)),
+                ('position', models.PositiveSmallIntegerField()),
+                ('score', models.PositiveIntegerField()),
+            ],
+            options={
+                'ordering': ('feed', 'position'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['created'], name='comment_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='newsranking',
+            name='news',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='news.news'),
+        ),
+        migrations.AddConstraint(
+            model_name='newsranking',
+            constraint=models.UniqueConstraint(fields=('feed', 'position'), name='ranking_feed_position_uniq'),
+        ),
+    ]
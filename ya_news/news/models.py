@@ -1,22 +1,148 @@
 from datetime import datetime
+from functools import partial
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils.text import Truncator
+
+from . import cache
+
+EXCERPT_WORDS = 15
+
+
+def make_excerpt(text):
+    """Начало текста для списков, как фильтр truncatewords."""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+class NewsQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """bulk_create не вызывает save(), поэтому заполняем excerpt здесь."""
+        objs = list(objs)
+        for news in objs:
+            news.excerpt = make_excerpt(news.text)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def update(self, **kwargs):
+        """
+        Вместе с text пересчитывает excerpt, как это делает save().
+
+        Если новый текст вычисляет сама база (выражение), начало
+        пересчитывается по записанному тексту в той же транзакции.
+        """
+        if 'text' not in kwargs or 'excerpt' in kwargs:
+            return super().update(**kwargs)
+        text = kwargs['text']
+        if not hasattr(text, 'resolve_expression'):
+            return super().update(**kwargs, excerpt=make_excerpt(text))
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list('pk', flat=True))
+            count = super().update(**kwargs)
+            changed = list(self.model._base_manager.using(self.db).filter(
+                pk__in=pks
+            ).only('text'))
+            for news in changed:
+                news.excerpt = make_excerpt(news.text)
+            self.model._base_manager.using(self.db).bulk_update(
+                changed, ['excerpt']
+            )
+        return count
+
+    def change_comment_count(self, delta):
+        """
+        Сдвигает счётчик комментариев на delta.
+
+        Изменение выполняется в базе одним UPDATE со сдвигом F(),
+        поэтому параллельные комментарии не теряют приращения.
+        Счётчик не опускается ниже нуля.
+        """
+        value = F('comment_count') + delta
+        if delta < 0:
+            value = Greatest(value, 0)
+        return self.update(comment_count=value)
+
+    def reconcile_comment_counts(self):
+        """
+        Исправляет расхождение счётчика с числом комментариев.
+
+        Пересчёт и запись идут одним UPDATE, так что одновременные
+        изменения счётчика не затираются. UPDATE не отправляет сигналов,
+        поэтому кеш страниц исправленных новостей сбрасывается здесь.
+        Возвращает число исправленных новостей.
+        """
+        actual = Coalesce(Subquery(
+            Comment.objects.filter(
+                news=OuterRef('pk')
+            ).order_by().values('news').annotate(
+                count=Count('pk')
+            ).values('count')
+        ), 0)
+        with transaction.atomic(using=self.db):
+            fixed = list(
+                self.exclude(comment_count=actual).values_list('pk', flat=True)
+            )
+            if not fixed:
+                return 0
+            transaction.on_commit(
+                partial(cache.invalidate_news_pages, *fixed), self.db
+            )
+            return self.filter(pk__in=fixed).update(comment_count=actual)
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
+    excerpt = models.TextField(blank=True, editable=False)
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = NewsQuerySet.as_manager()
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('date', 'id'), name='news_date_id_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Списки показывают только excerpt, записываем его вместе с text.
+
+        Сам excerpt заполняет обработчик pre_save, который срабатывает
+        и при загрузке фикстур.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields,
+                   forced_update):
+        """
+        Счётчик комментариев меняется только сдвигом в базе.
+
+        Поэтому UPDATE существующей строки его не перезаписывает, если
+        поле не названо в update_fields явно. Вставка (новая новость,
+        копия с pk = None, force_insert, повторная запись удалённой
+        строки) пишет значение из объекта, как обычно.
+        """
+        if update_fields is None:
+            values = [
+                value for value in values
+                if value[0].name != 'comment_count'
+            ]
+        return super()._do_update(
+            base_qs, using, pk_val, values, update_fields, forced_update
+        )
+
 
 class Comment(models.Model):
     news = models.ForeignKey(
@@ -32,6 +158,53 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(fields=('created',), name='comment_created_idx'),
+            models.Index(
+                fields=('news', 'created'),
+                name='comment_news_created_idx',
+            ),
+            models.Index(
+                fields=('author', 'created'),
+                name='comment_author_created_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+
+class NewsRanking(models.Model):
+    """
+    Позиция новости в заранее рассчитанной ленте.
+
+    Ленты пересчитывает команда refresh_rankings, страница ленты только
+    читает готовые строки по индексу (feed, position).
+    """
+
+    class Feed(models.TextChoices):
+        HOUR = 'hour', 'Обсуждают за час'
+        DAY = 'day', 'Обсуждают за сутки'
+        WEEK = 'week', 'Обсуждают за неделю'
+        DISCUSSED = 'discussed', 'Самые обсуждаемые'
+
+    feed = models.CharField(max_length=16, choices=Feed.choices)
+    position = models.PositiveSmallIntegerField()
+    news = models.ForeignKey(
+        News,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    score = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ('feed', 'position')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('feed', 'position'),
+                name='ranking_feed_position_uniq',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.feed} #{self.position}: {self.news_id}'
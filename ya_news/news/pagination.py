@@ -0,0 +1,132 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Курсор не удалось разобрать."""
+
+
+def encode_cursor(values):
+    """Упаковывает значения ключа в строку для URL."""
+    raw = json.dumps([str(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, length):
+    """Распаковывает курсор, созданный encode_cursor."""
+    padding = '=' * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursor(cursor)
+    if not all(isinstance(value, str) for value in values):
+        raise InvalidCursor(cursor)
+    return values
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Постраничный вывод по ключу (keyset/cursor pagination).
+
+    Вместо OFFSET следующая страница выбирается условием
+    «строго после последней записи» по полям сортировки, поэтому
+    стоимость запроса не зависит от того, как далеко листает читатель.
+    Последнее поле сортировки должно быть уникальным (обычно id).
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+
+    def _to_python(self, cursor, values):
+        """
+        Значения курсора в типах полей ключа.
+
+        Курсор приходит от клиента: значение, которое не подходит
+        полю, должно давать InvalidCursor, а не ошибку в запросе.
+        """
+        opts = self.queryset.model._meta
+        converted = []
+        for field, value in zip(self.ordering, values):
+            try:
+                value = opts.get_field(field.lstrip('-')).to_python(value)
+            except ValidationError:
+                raise InvalidCursor(cursor)
+            # Целые числа SQLite — 64-битные, большее число не сравнить.
+            if isinstance(value, int) and not -2**63 <= value < 2**63:
+                raise InvalidCursor(cursor)
+            converted.append(value)
+        return converted
+
+    def _after(self, values):
+        """
+        Условие «после записи с такими значениями ключа».
+
+        Граница по первому полю повторяет первое из условий ИЛИ,
+        но без неё SQLite не ограничивает поиск по индексу и читает
+        индекс с самого начала.
+        """
+        first = self.ordering[0]
+        lookup = 'lte' if first.startswith('-') else 'gte'
+        bound = Q(**{f'{first.lstrip("-")}__{lookup}': values[0]})
+        conditions = []
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {
+                previous.lstrip('-'): value
+                for previous, value in zip(self.ordering[:index], values)
+            }
+            conditions.append(
+                Q(**equal, **{f'{name}__{lookup}': values[index]})
+            )
+        return bound & reduce(or_, conditions)
+
+    def rows(self, cursor=None):
+        """
+        Записи страницы и ещё одна, по которой видно продолжение.
+
+        Ошибка в курсоре обнаруживается сразу, а сам запрос
+        выполняется при чтении.
+        """
+        queryset = self.queryset.order_by(*self.ordering)
+        if cursor:
+            values = self._to_python(
+                cursor, decode_cursor(cursor, len(self.ordering))
+            )
+            queryset = queryset.filter(self._after(values))
+        return queryset[:self.per_page + 1]
+
+    def cursor_for(self, row):
+        """Курсор на запись row: объект модели или словарь из values()."""
+        names = (field.lstrip('-') for field in self.ordering)
+        if isinstance(row, dict):
+            return encode_cursor(row[name] for name in names)
+        return encode_cursor(getattr(row, name) for name in names)
+
+    def page(self, cursor=None):
+        object_list = list(self.rows(cursor))
+        if len(object_list) <= self.per_page:
+            return KeysetPage(object_list)
+        object_list = object_list[:self.per_page]
+        return KeysetPage(object_list, self.cursor_for(object_list[-1]))
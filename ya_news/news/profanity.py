@@ -0,0 +1,95 @@
+"""
+Поиск запрещённых слов в тексте за один проход.
+
+Используется автомат Ахо — Корасик: по списку слов один раз строится
+бор с суффиксными ссылками, после чего текст любой длины проверяется
+за время, пропорциональное его длине, независимо от размера списка.
+"""
+from collections import deque
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class WordMatcher:
+    """Автомат Ахо — Корасик для проверки вхождения любого из слов."""
+
+    def __init__(self, words):
+        self._goto = [{}]
+        self._fail = [0]
+        self._terminal = [False]
+        for word in words:
+            self._add(word.lower())
+        self._build()
+
+    def _add(self, word):
+        if not word:
+            return
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(False)
+            state = next_state
+        self._terminal[state] = True
+
+    def _build(self):
+        """Строит суффиксные ссылки обходом бора в ширину."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                if self._terminal[self._fail[next_state]]:
+                    self._terminal[next_state] = True
+
+    def search(self, text):
+        """Есть ли в тексте хотя бы одно слово из списка."""
+        goto, fail, terminal = self._goto, self._fail, self._terminal
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if terminal[state]:
+                return True
+        return False
+
+
+def load_words(path):
+    """Слова из файла: по одному в строке, # начинает комментарий."""
+    with open(path, encoding='utf-8') as source:
+        for line in source:
+            word = line.split('#', 1)[0].strip()
+            if word:
+                yield word
+
+
+@lru_cache(maxsize=None)
+def get_bad_words_matcher():
+    """
+    Автомат для списка запрещённых слов.
+
+    Слова берутся из файла BAD_WORDS_FILE, а если он не задан —
+    из news.forms.BAD_WORDS. Автомат строится один раз на процесс.
+    """
+    if settings.BAD_WORDS_FILE:
+        return WordMatcher(load_words(settings.BAD_WORDS_FILE))
+    from .forms import BAD_WORDS
+    return WordMatcher(BAD_WORDS)
+
+
+@receiver(setting_changed)
+def reset_bad_words_matcher(setting, **kwargs):
+    if setting == 'BAD_WORDS_FILE':
+        get_bad_words_matcher.cache_clear()
@@ -1,8 +1,12 @@
+from contextlib import contextmanager
 from datetime import timedelta
 
 import pytest
 from django.contrib.auth import get_user_model
 from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connections
 from django.urls import reverse
 from django.utils import timezone
 from django.test import Client
@@ -12,6 +16,34 @@ from news.models import Comment, News
 
 User = get_user_model()
 
+# Максимальное число SQL-запросов на GET-запрос к каждому маршруту
+# для авторизованного пользователя при холодном кеше. Бюджет не должен
+# зависеть от количества записей в базе.
+QUERY_BUDGETS = {
+    'news:home': 3,
+    'news:search': 4,
+    'news:feed': 3,
+    'news:archive': 5,
+    'news:api_news': 1,
+    'news:api_comments': 2,
+    'news:detail': 5,
+    'news:comments': 4,
+    'news:edit': 3,
+    'news:delete': 3,
+    'news:home_async': 3,
+    'news:detail_async': 5,
+    'users:login': 2,
+    'users:logout': 4,
+    'users:signup': 2,
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Каждый тест начинается с пустого кеша."""
+    for cache in caches.all():
+        cache.clear()
+
 
 @pytest.fixture
 def author():
@@ -144,3 +176,44 @@ def url_signup():
 def bad_words():
     """Плохие слова."""
     return {'text': f' Текст {BAD_WORDS[0]}, текст.'}
+
+
+@pytest.fixture
+def url_comments(news):
+    """Адрес следующей страницы комментариев."""
+    return reverse('news:comments', args=(news.id,))
+
+
+@pytest.fixture
+def query_budget(django_assert_max_num_queries):
+    """
+    Проверка бюджета запросов маршрута.
+
+    Использование: with query_budget('news:home'): client.get(...)
+    """
+    def check(url_name):
+        return django_assert_max_num_queries(QUERY_BUDGETS[url_name])
+    return check
+
+
+@contextmanager
+def file_database(alias, path):
+    """
+    Отдельная база SQLite в файле под псевдонимом alias.
+
+    База не связана с тестовой и видна всем потокам; обращения к ней
+    должны быть разблокированы (фикстуры db или django_db_blocker).
+    """
+    connections.settings[alias] = {
+        **settings.DB_PROFILES['tuned'],
+        'NAME': str(path),
+    }
+    connections.ensure_defaults(alias)
+    connections.prepare_test_settings(alias)
+    try:
+        call_command('migrate', database=alias, verbosity=0)
+        yield alias
+    finally:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
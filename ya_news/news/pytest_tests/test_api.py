@@ -0,0 +1,135 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from news.models import Comment, News
+from news.pagination import encode_cursor
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def url_api_news():
+    return reverse('news:api_news')
+
+
+@pytest.fixture
+def url_api_comments(news):
+    return reverse('news:api_comments', args=(news.pk,))
+
+
+def get_json(client, url, params=None):
+    response = client.get(url, params)
+    return response, json.loads(b''.join(response.streaming_content))
+
+
+def all_pages(client, url, params):
+    """Все страницы списка по ссылкам next."""
+    pages = []
+    response, data = get_json(client, url, params)
+    pages.append(data['results'])
+    while data['next']:
+        response, data = get_json(client, data['next'])
+        pages.append(data['results'])
+    return pages
+
+
+def test_news_api_default_fields(client, url_api_news, list_news):
+    """Список новостей отдаёт поля по умолчанию от свежих к старым."""
+    response, data = get_json(client, url_api_news)
+    assert response['Content-Type'] == 'application/json'
+    first = News.objects.order_by('-date', '-id').first()
+    assert data['results'][0] == {
+        'id': first.pk,
+        'title': first.title,
+        'date': first.date.isoformat(),
+        'excerpt': first.excerpt,
+        'comment_count': first.comment_count,
+    }
+
+
+def test_news_api_field_selection(client, url_api_news, news):
+    """Параметр fields задаёт поля ответа."""
+    response, data = get_json(client, url_api_news, {'fields': 'title,id'})
+    assert data['results'] == [{'title': news.title, 'id': news.pk}]
+
+
+def test_news_api_cursor_pages(client, url_api_news, list_news):
+    """Страницы по курсору выводят все новости без повторов."""
+    pages = all_pages(client, url_api_news, {'limit': 4, 'fields': 'id'})
+    assert [len(page) for page in pages] == [4, 4, 3]
+    assert [row['id'] for page in pages for row in page] == list(
+        News.objects.order_by('-date', '-id').values_list('pk', flat=True)
+    )
+
+
+def test_comments_api_pages(client, author, news, url_api_comments):
+    """Комментарии выводятся по порядку добавления со ссылкой next."""
+    now = timezone.now()
+    for i in range(5):
+        comment = Comment.objects.create(
+            news=news, author=author, text=f'Текст {i}'
+        )
+        comment.created = now + timedelta(minutes=i)
+        comment.save()
+    pages = all_pages(client, url_api_comments, {'limit': 2})
+    assert [len(page) for page in pages] == [2, 2, 1]
+    rows = [row for page in pages for row in page]
+    assert [row['text'] for row in rows] == [f'Текст {i}' for i in range(5)]
+    assert rows[0]['author'] == author.username
+
+
+@pytest.mark.parametrize('rows', (1, 300))
+def test_api_fixed_query_count(
+        client, author, news, url_api_news, url_api_comments, rows,
+        django_assert_num_queries
+):
+    """Число запросов не зависит от объёма страницы."""
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text='Текст') for _ in range(rows)
+    )
+    with django_assert_num_queries(1):
+        get_json(client, url_api_news)
+    with django_assert_num_queries(2):
+        response, data = get_json(
+            client, url_api_comments, {'limit': 1000}
+        )
+    assert len(data['results']) == rows
+
+
+def test_comments_api_is_streamed(client, url_api_comments, comment):
+    response = client.get(url_api_comments)
+    assert response.streaming
+
+
+@pytest.mark.parametrize(
+    'params',
+    (
+        {'fields': 'id,password'},
+        {'limit': '0'},
+        {'limit': 'много'},
+        {'limit': '²'},
+        {'limit': '101'},
+        {'cursor': 'мусор'},
+        {'cursor': encode_cursor(['вчера', 'первая'])},
+    )
+)
+def test_news_api_bad_params(client, url_api_news, params):
+    """Некорректные параметры дают 400 с описанием ошибки."""
+    response = client.get(url_api_news, params)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'error' in response.json()
+
+
+def test_comments_api_unknown_news(client):
+    response = client.get(reverse('news:api_comments', args=(0,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_api_is_read_only(client, url_api_news):
+    response = client.post(url_api_news)
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
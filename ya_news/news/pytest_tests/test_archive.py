@@ -0,0 +1,112 @@
+from datetime import date
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+
+from news.models import News
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def archive():
+    """По две новости на каждый из пяти дней в разных годах и месяцах."""
+    days = (
+        date(2021, 3, 5), date(2022, 1, 10), date(2022, 1, 20),
+        date(2022, 2, 1), date(2023, 12, 31),
+    )
+    for day in days:
+        for i in range(2):
+            News.objects.create(title=f'{day} {i}', text='Текст', date=day)
+    return days
+
+
+def archive_pages(client, url):
+    """Все страницы архива подряд по курсору."""
+    pages = []
+    response = client.get(url)
+    while True:
+        page = response.context['page']
+        pages.append([news.pk for news in page.object_list])
+        if not page.has_next:
+            return pages
+        response = client.get(url, {'cursor': page.next_cursor})
+
+
+def expected_ids(**filters):
+    return list(
+        News.objects.filter(**filters).order_by(
+            '-date', '-id'
+        ).values_list('pk', flat=True)
+    )
+
+
+def test_archive_keyset_pages(client, settings, archive):
+    """Страницы архива по курсору выводят все новости без повторов."""
+    settings.NEWS_ARCHIVE_PER_PAGE = 3
+    pages = archive_pages(client, reverse('news:archive'))
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    assert sum(pages, []) == expected_ids()
+
+
+@pytest.mark.parametrize(
+    'args, filters',
+    (
+        ((2022,), {'date__year': 2022}),
+        ((2022, 1), {'date__year': 2022, 'date__month': 1}),
+        ((2022, 1, 20), {'date': date(2022, 1, 20)}),
+        ((2023, 12), {'date__year': 2023, 'date__month': 12}),
+    )
+)
+def test_archive_periods(client, settings, archive, args, filters):
+    """Архив за год, месяц и день выводит только новости периода."""
+    settings.NEWS_ARCHIVE_PER_PAGE = 1
+    pages = archive_pages(client, reverse('news:archive', args=args))
+    assert sum(pages, []) == expected_ids(**filters)
+
+
+@pytest.mark.parametrize(
+    'args, expected',
+    (
+        ((), [date(2023, 1, 1), date(2022, 1, 1), date(2021, 1, 1)]),
+        ((2022,), [date(2022, month, 1) for month in range(1, 13)]),
+        ((2022, 2), [date(2022, 2, day) for day in range(1, 29)]),
+        ((2022, 2, 1), []),
+    )
+)
+def test_archive_subperiods(client, archive, args, expected):
+    """Навигация ведёт к вложенным периодам."""
+    response = client.get(reverse('news:archive', args=args))
+    assert response.context['subperiods'] == expected
+
+
+@pytest.mark.parametrize(
+    'args',
+    ((2022, 13), (2022, 2, 30), (0,)),
+)
+def test_archive_invalid_date(client, args):
+    """Несуществующая дата приводит к 404."""
+    response = client.get(reverse('news:archive', args=args))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_archive_invalid_cursor(client, archive):
+    response = client.get(reverse('news:archive'), {'cursor': 'мусор'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_archive_deep_page_query_count(
+        client, settings, archive, django_assert_num_queries
+):
+    """Последняя страница архива читается так же, как первая."""
+    settings.NEWS_ARCHIVE_PER_PAGE = 1
+    url = reverse('news:archive', args=(2022,))
+    with django_assert_num_queries(1):
+        response = client.get(url)
+    cursor = response.context['page'].next_cursor
+    for _ in range(5):
+        with django_assert_num_queries(1):
+            response = client.get(url, {'cursor': cursor})
+        cursor = response.context['page'].next_cursor
+    assert cursor is None
@@ -0,0 +1,123 @@
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.test import AsyncClient
+from django.urls import reverse
+
+from news.forms import CommentForm
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def url_home_async():
+    return reverse('news:home_async')
+
+
+@pytest.fixture
+def url_detail_async(news):
+    return reverse('news:detail_async', args=(news.pk,))
+
+
+def asgi_request(method, url, user=None, data=None, **extra):
+    """Запрос через ASGI-обработчик, как под uvicorn."""
+    client = AsyncClient()
+    if user is not None:
+        client.force_login(user)
+
+    async def send():
+        return await getattr(client, method)(url, data, **extra)
+
+    return async_to_sync(send)()
+
+
+def asgi_get(url, user=None):
+    return asgi_request('get', url, user)
+
+
+def test_async_home_matches_sync(
+        client, list_news, url_home, url_home_async
+):
+    """Асинхронная главная выводит те же новости, что и синхронная."""
+    expected = list(client.get(url_home).context['object_list'])
+    response = asgi_get(url_home_async)
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['object_list']) == expected
+
+
+def test_async_home_uses_fragment_cache(
+        list_news, url_home_async, django_assert_num_queries
+):
+    """
+    При закешированном списке главная читает только сами новости.
+
+    Список загружается до отрисовки в любом случае, чтобы шаблон
+    в цикле событий не обращался к базе.
+    """
+    first = asgi_get(url_home_async)
+    with django_assert_num_queries(1):
+        assert asgi_get(url_home_async).content == first.content
+
+
+def test_async_home_renders_after_fragment_eviction(
+        list_news, url_home_async
+):
+    """Фрагмент, вытесненный из кеша, отрисовывается заново без ошибки."""
+    first = asgi_get(url_home_async)
+    for backend in caches.all():
+        backend.clear()
+    response = asgi_get(url_home_async)
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == first.content
+
+
+def test_async_detail(author, comment, url_detail_async):
+    """Асинхронная страница новости выводит комментарии и форму."""
+    response = asgi_get(url_detail_async, author)
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['comments'].object_list) == [comment]
+    assert isinstance(response.context['form'], CommentForm)
+
+
+def test_async_detail_not_found():
+    """Несуществующая новость — ошибка 404."""
+    response = asgi_get(reverse('news:detail_async', args=(0,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_async_detail_is_read_only(url_detail_async, form_data):
+    """Асинхронная страница принимает только чтение."""
+    response = asgi_request('post', url_detail_async, data=form_data)
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+def test_async_detail_cache_shared_with_sync(
+        client, news, url_detail, url_detail_async,
+        django_assert_num_queries
+):
+    """Анонимная страница из кеша отдаётся без запросов к базе."""
+    first = asgi_get(url_detail_async)
+    with django_assert_num_queries(0):
+        assert asgi_get(url_detail_async).content == first.content
+        assert client.get(url_detail).content == first.content
+
+
+def test_async_server_timing_counts_queries(author, url_detail_async):
+    """Под ASGI запросы к базе из потока попадают в замеры."""
+    response = asgi_get(url_detail_async, author)
+    assert 'desc="5 queries"' in response['Server-Timing']
+
+
+@pytest.mark.parametrize('cached', (True, False))
+def test_async_detail_not_modified(author, comment, url_detail_async, cached):
+    """Асинхронная страница новости отвечает 304 на актуальный ETag."""
+    user = None if cached else author
+    etag = asgi_get(url_detail_async, user)['ETag']
+    # AsyncClient в Django 3.2 передаёт extra как заголовки по имени.
+    response = asgi_request(
+        'get', url_detail_async, user, **{'If-None-Match': etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response['ETag'] == etag
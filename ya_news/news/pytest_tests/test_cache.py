@@ -0,0 +1,155 @@
+import pytest
+
+from news import cache
+from news.models import Comment, News
+from yanews.settings import prod
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(params=('locmem', 'filebased', 'prod'))
+def cache_backend(request, settings, tmp_path):
+    """Кеш страниц на разных бэкендах."""
+    backends = {
+        'locmem': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'filebased': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        },
+        'prod': {**prod.CACHES['default'], 'LOCATION': str(tmp_path)},
+    }
+    settings.CACHES = {
+        'default': settings.CACHES['default'],
+        'pages': backends[request.param],
+    }
+    settings.NEWS_CACHE_ALIAS = 'pages'
+    return request.param
+
+
+def test_prod_page_cache_is_shared_between_processes():
+    """В production страницы и их версии не в памяти одного процесса."""
+    backend = prod.CACHES[prod.NEWS_CACHE_ALIAS]['BACKEND']
+    assert backend != 'django.core.cache.backends.locmem.LocMemCache'
+
+
+def test_anonymous_detail_page_is_cached(
+        cache_backend, client, news, comment, url_detail,
+        django_assert_num_queries
+):
+    """Повторный анонимный запрос не обращается к базе."""
+    first = client.get(url_detail)
+    with django_assert_num_queries(0):
+        second = client.get(url_detail)
+    assert second.content == first.content
+
+
+def test_new_comment_invalidates_detail_page(
+        cache_backend, client, author_client, news, url_detail, form_data,
+        django_capture_on_commit_callbacks
+):
+    """Новый комментарий сразу виден анонимному читателю."""
+    client.get(url_detail)
+    with django_capture_on_commit_callbacks(execute=True):
+        author_client.post(url_detail, data=form_data)
+    response = client.get(url_detail)
+    assert form_data['text'] in response.content.decode()
+
+
+def test_edit_comment_invalidates_detail_page(
+        cache_backend, client, author_client, comment, url_detail, url_edit,
+        form_data, django_capture_on_commit_callbacks
+):
+    """Отредактированный комментарий сразу виден анонимному читателю."""
+    client.get(url_detail)
+    with django_capture_on_commit_callbacks(execute=True):
+        author_client.post(url_edit, data=form_data)
+    content = client.get(url_detail).content.decode()
+    assert form_data['text'] in content
+    assert comment.text not in content
+
+
+def test_delete_comment_invalidates_detail_page(
+        cache_backend, client, author_client, comment, url_detail, url_delete,
+        django_capture_on_commit_callbacks
+):
+    """Удалённый комментарий сразу пропадает со страницы."""
+    client.get(url_detail)
+    with django_capture_on_commit_callbacks(execute=True):
+        author_client.post(url_delete)
+    assert comment.text not in client.get(url_detail).content.decode()
+
+
+def test_authorized_user_bypasses_cache(
+        cache_backend, client, author_client, comment, url_detail
+):
+    """Авторизованный пользователь получает свою версию страницы."""
+    client.get(url_detail)
+    response = author_client.get(url_detail)
+    assert 'form' in response.context
+
+
+def test_home_page_list_is_cached(
+        client, list_news, url_home, django_assert_num_queries
+):
+    """Повторный запрос главной не обращается к базе."""
+    first = client.get(url_home)
+    with django_assert_num_queries(0):
+        second = client.get(url_home)
+    assert second.content == first.content
+
+
+def test_news_save_invalidates_home_page(
+        client, news, url_home, django_capture_on_commit_callbacks
+):
+    """Изменённый заголовок новости сразу виден на главной."""
+    client.get(url_home)
+    news.title = 'Новый заголовок'
+    with django_capture_on_commit_callbacks(execute=True):
+        news.save()
+    assert news.title in client.get(url_home).content.decode()
+
+
+def test_comment_invalidates_home_page(
+        client, author_client, news, url_home, url_detail, form_data,
+        django_capture_on_commit_callbacks
+):
+    """Новый комментарий сразу меняет счётчик на главной."""
+    assert 'Комментариев' not in client.get(url_home).content.decode()
+    with django_capture_on_commit_callbacks(execute=True):
+        author_client.post(url_detail, data=form_data)
+    assert 'Комментариев: 1' in client.get(url_home).content.decode()
+
+
+def test_invalidation_waits_for_commit(
+        cache_backend, client, author, news, url_detail,
+        django_capture_on_commit_callbacks
+):
+    """
+    До фиксации транзакции страница в кеше не сбрасывается.
+
+    Иначе читатель успел бы сохранить под новой версией страницу,
+    отрисованную по ещё не изменённым строкам.
+    """
+    first = client.get(url_detail).content
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        Comment.objects.create(news=news, author=author, text='Новый')
+        assert client.get(url_detail).content == first
+    assert callbacks
+    assert 'Новый' in client.get(url_detail).content.decode()
+
+
+def test_reconcile_invalidates_pages(
+        cache_backend, client, news, url_home, url_detail,
+        django_capture_on_commit_callbacks
+):
+    """Исправленный счётчик сразу виден на главной и странице новости."""
+    News.objects.filter(pk=news.pk).update(comment_count=5)
+    assert 'Комментариев: 5' in client.get(url_home).content.decode()
+    client.get(url_detail)
+    detail_key = cache.detail_page_key(news.pk)
+    with django_capture_on_commit_callbacks(execute=True):
+        assert News.objects.reconcile_comment_counts() == 1
+    assert 'Комментариев' not in client.get(url_home).content.decode()
+    assert cache.detail_page_key(news.pk) != detail_key
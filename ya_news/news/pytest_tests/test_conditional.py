@@ -0,0 +1,146 @@
+from http import HTTPStatus
+
+from datetime import date, datetime, timezone
+from time import time_ns
+
+import pytest
+from django.utils.http import http_date
+
+from news import cache
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Часы для версий кеша, которые можно переводить вперёд."""
+    clock = {'now': time_ns()}
+    monkeypatch.setattr(cache, 'time_ns', lambda: clock['now'])
+    return clock
+
+
+def test_detail_page_has_validators(client, clock, comment, url_detail):
+    """Страница новости отдаёт ETag и Last-Modified."""
+    clock['now'] = 0
+    response = client.get(url_detail)
+    assert response['ETag'].startswith('"')
+    assert response['Last-Modified'] == http_date(
+        int(comment.created.timestamp())
+    )
+
+
+def test_last_modified_uses_site_timezone(
+        client, settings, clock, news, url_detail
+):
+    """Новость без комментариев изменена в полночь своей даты на сайте."""
+    settings.TIME_ZONE = 'Etc/GMT-14'
+    News.objects.filter(pk=news.pk).update(date=date(2020, 1, 1))
+    clock['now'] = 0
+    response = client.get(url_detail)
+    assert response['Last-Modified'] == http_date(
+        datetime(2019, 12, 31, 10, tzinfo=timezone.utc).timestamp()
+    )
+
+
+def test_anonymous_not_modified_from_cache(
+        client, comment, url_detail, django_assert_num_queries
+):
+    """Анонимный читатель получает 304 из кеша без запросов к базе."""
+    etag = client.get(url_detail)['ETag']
+    with django_assert_num_queries(0):
+        response = client.get(url_detail, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response['ETag'] == etag
+
+
+def test_not_modified_single_metadata_query(
+        author_client, comment, url_detail, django_assert_num_queries
+):
+    """
+    Без кеша 304 отдаётся после одного запроса валидаторов.
+
+    Два других запроса читают сессию и пользователя.
+    """
+    etag = author_client.get(url_detail)['ETag']
+    with django_assert_num_queries(3):
+        response = author_client.get(url_detail, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not response.templates
+
+
+def test_if_modified_since(
+        client, comment, url_detail, django_assert_num_queries
+):
+    """Запрос с If-Modified-Since без изменений получает 304."""
+    last_modified = client.get(url_detail)['Last-Modified']
+    cache.get_cache().delete(cache.detail_page_key(comment.news_id))
+    with django_assert_num_queries(1):
+        response = client.get(
+            url_detail, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize('change', ('edit', 'delete', 'news'))
+def test_changes_update_last_modified(
+        client, clock, news, comment, url_detail, change,
+        django_capture_on_commit_callbacks
+):
+    """
+    Правки без новых комментариев сдвигают Last-Modified.
+
+    Дата новости и время последнего комментария от них не меняются,
+    в заголовок попадает время версии кеша.
+    """
+    last_modified = client.get(url_detail)['Last-Modified']
+    clock['now'] += 2 * 10 ** 9
+    with django_capture_on_commit_callbacks(execute=True):
+        if change == 'edit':
+            comment.text = 'Исправленный'
+            comment.save()
+        elif change == 'delete':
+            comment.delete()
+        else:
+            news.title = 'Новый заголовок'
+            news.save()
+    response = client.get(url_detail, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == HTTPStatus.OK
+    assert response['Last-Modified'] != last_modified
+
+
+@pytest.mark.parametrize('change', ('comment', 'edit', 'news'))
+def test_changes_update_etag(
+        client, author, news, comment, url_detail, change,
+        django_capture_on_commit_callbacks
+):
+    """Новый комментарий, правка комментария и новости меняют ETag."""
+    etag = client.get(url_detail)['ETag']
+    with django_capture_on_commit_callbacks(execute=True):
+        if change == 'comment':
+            Comment.objects.create(news=news, author=author, text='Новый')
+        elif change == 'edit':
+            comment.text = 'Исправленный'
+            comment.save()
+        else:
+            news.title = 'Новый заголовок'
+            news.save()
+    response = client.get(url_detail, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+def test_etag_differs_between_users(
+        client, author_client, reader_client, comment, url_detail
+):
+    """Разметка у каждого читателя своя, и ETag тоже."""
+    etags = {
+        client.get(url_detail)['ETag'],
+        author_client.get(url_detail)['ETag'],
+        reader_client.get(url_detail)['ETag'],
+    }
+    assert len(etags) == 3
+    response = reader_client.get(
+        url_detail, HTTP_IF_NONE_MATCH=author_client.get(url_detail)['ETag']
+    )
+    assert response.status_code == HTTPStatus.OK
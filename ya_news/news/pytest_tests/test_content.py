@@ -1,9 +1,16 @@
+import base64
+from http import HTTPStatus
+
 import pytest
 
 from news.forms import CommentForm
 from django.conf import settings
+from django.core.management import call_command
+from django.db.models import Value
+from django.db.models.functions import Concat
 
 from news.models import News
+from news.pagination import encode_cursor
 
 pytestmark = pytest.mark.django_db
 
@@ -60,3 +67,97 @@ def test_form_for_anonymous_and_authorized_clients(
     assert have_form is form_in_context
     if have_form:
         assert isinstance(response.context['form'], CommentForm)
+
+
+def test_home_page_comment_count(
+        client, url_home, news, comments_list, django_assert_num_queries
+):
+    """
+    Число комментариев на главной берётся из счётчика в новости.
+    Страница строится одним запросом без соединения с комментариями.
+    """
+    with django_assert_num_queries(1) as captured:
+        response = client.get(url_home)
+    sql = captured.captured_queries[0]['sql']
+    assert 'news_comment' not in sql
+    assert 'GROUP BY' not in sql
+    first_news = response.context['object_list'][0]
+    assert first_news.comment_count == news.comment_set.count()
+
+
+def test_detail_page_comments_keyset_pagination(
+        client, settings, news, comments_list, url_detail, url_comments
+):
+    """
+    Комментарии выводятся страницами по ключу (created, id).
+    Пройдя по курсорам, читатель получает все комментарии по порядку.
+    """
+    settings.COMMENTS_PER_PAGE = 3
+    page = client.get(url_detail).context['comments']
+    seen = list(page.object_list)
+    while page.has_next:
+        response = client.get(url_comments, {'cursor': page.next_cursor})
+        page = response.context['comments']
+        assert len(page.object_list) <= settings.COMMENTS_PER_PAGE
+        seen.extend(page.object_list)
+    assert seen == list(news.comment_set.order_by('created', 'id'))
+
+
+@pytest.mark.parametrize(
+    'cursor',
+    (
+        'не-курсор',
+        encode_cursor(['x', 'y']),
+        encode_cursor(['2020-01-01 10:00:00+00:00', 'y']),
+        encode_cursor(['2020-01-01 10:00:00+00:00', '9' * 30]),
+        base64.urlsafe_b64encode(b'[null, 1]').decode(),
+    )
+)
+@pytest.mark.parametrize(
+    'url', (pytest.lazy_fixture('url_comments'),
+            pytest.lazy_fixture('url_detail'))
+)
+def test_comments_page_invalid_cursor(client, news, url, cursor):
+    """Некорректный курсор, в том числе с неподходящими значениями, — 404."""
+    response = client.get(url, {'cursor': cursor})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_home_page_reads_excerpt_not_text(client, url_home, author):
+    """Главная показывает сохранённое начало новости без полного текста."""
+    text = ' '.join(f'слово{i}' for i in range(1000))
+    News.objects.create(title='Длинная', text=text)
+    response = client.get(url_home)
+    news = response.context['object_list'][0]
+    assert 'text' in news.get_deferred_fields()
+    assert news.excerpt == text.split(' слово15')[0] + ' …'
+    assert news.excerpt in response.content.decode()
+
+
+def test_excerpt_follows_text(news):
+    """Начало новости обновляется при save() и bulk_create()."""
+    news.text = 'Новый текст'
+    news.save(update_fields=['text'])
+    news.refresh_from_db()
+    assert news.excerpt == 'Новый текст'
+    News.objects.bulk_create([News(title='Пакет', text='Пакет')])
+    assert News.objects.get(title='Пакет').excerpt == 'Пакет'
+
+
+def test_excerpt_filled_on_loaddata():
+    """Фикстура загружается в обход save(), начало всё равно заполнено."""
+    call_command('loaddata', 'news.json', verbosity=0)
+    assert News.objects.count() == 19
+    assert not News.objects.filter(excerpt='').exists()
+
+
+def test_excerpt_follows_update(news):
+    """Начало новости обновляется и при QuerySet.update()."""
+    News.objects.filter(pk=news.pk).update(text='Новый текст')
+    news.refresh_from_db()
+    assert news.excerpt == 'Новый текст'
+    News.objects.filter(pk=news.pk).update(
+        text=Concat('text', Value(' дополнен'))
+    )
+    news.refresh_from_db()
+    assert news.excerpt == 'Новый текст дополнен'
@@ -0,0 +1,50 @@
+import pytest
+from django.db import connection
+
+from news.models import Comment, News, NewsRanking
+from news.pagination import KeysetPaginator
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite',
+        reason='План запроса проверяется для SQLite.'
+    ),
+]
+
+
+def test_thread_uses_news_created_index(news):
+    """Ветка комментариев читается по индексу без сортировки."""
+    plan = Comment.objects.filter(
+        news=news
+    ).order_by('created', 'id').explain()
+    assert 'comment_news_created_idx' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_user_comments_use_author_created_index(author):
+    """Комментарии пользователя читаются по индексу без сортировки."""
+    plan = Comment.objects.filter(author=author).explain()
+    assert 'comment_author_created_idx' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_feed_uses_position_index():
+    """Лента читается по индексу (feed, position) без сортировки."""
+    plan = NewsRanking.objects.filter(
+        feed=NewsRanking.Feed.DAY
+    ).select_related('news').explain()
+    assert 'SEARCH news_newsranking USING INDEX' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_archive_page_uses_date_index():
+    """Страница архива по курсору ищет по индексу без сортировки."""
+    paginator = KeysetPaginator(
+        News.objects.all(), ordering=('-date', '-id'), per_page=20
+    )
+    plan = News.objects.order_by('-date', '-id').filter(
+        paginator._after(['2020-05-01', '100'])
+    ).explain()
+    assert 'SEARCH news_news USING INDEX news_date_id_idx (date<?)' in plan
+    assert 'TEMP B-TREE' not in plan
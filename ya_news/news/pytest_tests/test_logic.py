@@ -1,11 +1,15 @@
 from http import HTTPStatus
+from io import StringIO
 
 import pytest
 from pytest_django.asserts import assertFormError, assertRedirects
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
 
-from news.models import Comment
+from news.models import Comment, News
 from news.forms import WARNING
+from news.profanity import WordMatcher
 
 User = get_user_model()
 
@@ -111,3 +115,157 @@ def test_user_cant_delete_comment_of_another_user(
     assert comment.author == initial_comment_author
     assert comment.news == initial_comment_news
     assert comment.created == initial_comment_created
+
+
+@pytest.mark.django_db
+def test_bad_words_from_file(settings, tmp_path, author_client, url_detail):
+    """Список плохих слов можно загрузить из файла."""
+    words_file = tmp_path / 'bad_words.txt'
+    words_file.write_text('# Модерация\nкапуста\n', encoding='utf-8')
+    settings.BAD_WORDS_FILE = str(words_file)
+    comments_count = Comment.objects.count()
+    response = author_client.post(
+        url_detail, data={'text': 'Сплошная КАПУСТА!'}
+    )
+    assertFormError(response, 'form', 'text', [WARNING])
+    assert Comment.objects.count() == comments_count
+
+
+@pytest.mark.parametrize(
+    'text, expected',
+    (
+        ('пирожки', False),
+        ('в корзине абвх', True),
+        ('где-то вдгд рядом', True),
+        ('вд', False),
+    )
+)
+def test_word_matcher_overlapping_words(text, expected):
+    """Автомат находит слова, вложенные в другие слова списка."""
+    matcher = WordMatcher(('абвгд', 'бв', 'вдгд'))
+    assert matcher.search(text) is expected
+
+
+@pytest.mark.parametrize(
+    'url_fixture, method, expected_queries',
+    (
+        # Сессия, пользователь, новость, вставка комментария
+        # и сдвиг счётчика в одной точке сохранения.
+        ('url_detail', 'post', 7),
+        # Сессия, пользователь, комментарий с новостью, изменение.
+        ('url_edit', 'post', 4),
+        # Сессия, пользователь, комментарий с новостью, удаление
+        # и сдвиг счётчика в транзакции удаления.
+        ('url_delete', 'post', 5),
+        # Сессия, пользователь, комментарий с новостью.
+        ('url_edit', 'get', 3),
+        ('url_delete', 'get', 3),
+    )
+)
+@pytest.mark.django_db
+def test_comment_write_paths_query_count(
+    url_fixture, method, expected_queries, author_client, comment, form_data,
+    django_assert_num_queries, request
+):
+    """Каждый путь записи комментария читает объекты один раз."""
+    url = request.getfixturevalue(url_fixture)
+    with django_assert_num_queries(expected_queries):
+        getattr(author_client, method)(url, form_data)
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(
+    author_client, form_data, url_detail, news
+):
+    """Счётчик растёт при комментарии и уменьшается при удалении."""
+    author_client.post(url_detail, data=form_data)
+    author_client.post(url_detail, data=form_data)
+    news.refresh_from_db()
+    assert news.comment_count == 2
+    comment = Comment.objects.filter(news=news).first()
+    author_client.post(reverse('news:delete', args=(comment.id,)))
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_orm_writes(author, news):
+    """Счётчик ведётся и при записи комментариев в обход представлений."""
+    comment = Comment.objects.create(news=news, author=author, text='Текст')
+    news.refresh_from_db()
+    assert news.comment_count == 1
+    comment.delete()
+    news.refresh_from_db()
+    assert news.comment_count == 0
+
+
+@pytest.mark.django_db
+def test_news_save_keeps_comment_count(author_client, form_data, url_detail):
+    """Сохранение устаревшего объекта новости не сбрасывает счётчик."""
+    news = News.objects.get()
+    author_client.post(url_detail, data=form_data)
+    news.title = 'Новый заголовок'
+    news.save()
+    news.refresh_from_db()
+    assert news.title == 'Новый заголовок'
+    assert news.comment_count == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('how', ('copy', 'force_insert', 'deleted'))
+def test_news_save_inserts_rows(news, how):
+    """Сохранение вставляет строку, как и у любой модели Django."""
+    pk = news.pk
+    if how == 'copy':
+        news.pk = None
+        news.save()
+        assert news.pk != pk
+    elif how == 'force_insert':
+        News.objects.filter(pk=pk).delete()
+        news.save(force_insert=True)
+    else:
+        News.objects.filter(pk=pk).delete()
+        news.save()
+    assert News.objects.filter(pk=news.pk, title=news.title).exists()
+
+
+@pytest.mark.django_db
+def test_reconcile_comment_counts(author, list_news):
+    """Команда пачками исправляет разошедшиеся счётчики."""
+    all_news = list(News.objects.order_by('pk'))
+    drifted = all_news[:3]
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text='Текст') for news in drifted
+    )
+    News.objects.filter(pk=all_news[-1].pk).update(comment_count=5)
+    stdout = StringIO()
+    call_command('reconcile_comment_counts', batch_size=2, stdout=stdout)
+    assert 'Исправлено счётчиков: 4' in stdout.getvalue()
+    counts = dict(News.objects.values_list('pk', 'comment_count'))
+    assert counts == {
+        news.pk: int(news in drifted) for news in all_news
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('comment_count', (1, 50))
+def test_news_delete_query_count(
+        author, news, comment_count, django_assert_num_queries,
+        django_capture_on_commit_callbacks
+):
+    """
+    Удаление новости стоит одинаково при любом числе комментариев.
+
+    Чтение комментариев, удаление мест в подборках, комментариев
+    и самой новости. Счётчик удаляемой новости не сдвигается, кеш
+    сбрасывается один раз.
+    """
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text='Текст')
+        for _ in range(comment_count)
+    )
+    with django_capture_on_commit_callbacks() as callbacks:
+        with django_assert_num_queries(4):
+            news.delete()
+    assert len(callbacks) == 1
+    assert not Comment.objects.exists()
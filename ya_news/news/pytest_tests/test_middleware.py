@@ -0,0 +1,56 @@
+import pytest
+from django.test import Client
+
+from yanews.middleware import registry
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    registry.clear()
+
+
+def server_timing(response):
+    """Разбирает Server-Timing в словарь {метрика: параметры}."""
+    metrics = {}
+    for metric in response['Server-Timing'].split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+def test_server_timing_header(client, news, comment, url_detail):
+    """Ответ содержит время запроса, SQL и отрисовки шаблона."""
+    timing = server_timing(client.get(url_detail))
+    assert set(timing) == {'db', 'render', 'total'}
+    assert timing['db']['desc'] == '"3 queries"'
+    assert float(timing['render']['dur']) > 0
+    assert float(timing['total']['dur']) >= float(timing['db']['dur'])
+
+
+def test_histograms_by_url_name(client, news, url_home, url_detail):
+    """Замеры копятся в гистограммах по имени маршрута."""
+    client.get(url_home)
+    client.get(url_home)
+    client.get(url_detail)
+    assert registry.get('news:home', 'request_seconds').count == 2
+    assert registry.get('news:detail', 'db_queries').sum == 3
+    metrics = registry.render()
+    assert 'yanews_request_seconds_count{view="news:home"} 2' in metrics
+
+
+def test_histograms_dump(settings, tmp_path, client, url_home):
+    """Гистограммы выгружаются в файл для сбора метрик."""
+    dump_path = tmp_path / 'metrics.prom'
+    settings.PERF_TIMING_DUMP_PATH = str(dump_path)
+    settings.PERF_TIMING_DUMP_INTERVAL = 0
+    Client().get(url_home)
+    assert 'view="news:home"' in dump_path.read_text(encoding='utf-8')
+
+
+def test_timing_can_be_disabled(settings, url_home):
+    """При выключенной настройке middleware не подключается."""
+    settings.PERF_TIMING_ENABLED = False
+    response = Client().get(url_home)
+    assert not response.has_header('Server-Timing')
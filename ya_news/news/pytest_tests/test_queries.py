@@ -0,0 +1,80 @@
+import pytest
+from django.urls import URLResolver, get_resolver, reverse
+
+from news.models import Comment, News
+from .conftest import QUERY_BUDGETS
+
+pytestmark = pytest.mark.django_db
+
+ROW_COUNTS = (1, 100, 10_000)
+SKIPPED_NAMESPACES = ('admin',)
+
+
+def route_names(patterns, namespace=None):
+    """Имена всех маршрутов проекта с учётом пространств имён."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            inner = pattern.namespace or namespace
+            if inner not in SKIPPED_NAMESPACES:
+                yield from route_names(pattern.url_patterns, inner)
+        elif pattern.name:
+            yield f'{namespace}:{pattern.name}' if namespace else pattern.name
+
+
+@pytest.fixture(params=ROW_COUNTS)
+def many_rows(request, author, news):
+    """Новости и комментарии к одной из них в заданном количестве."""
+    News.objects.bulk_create(
+        News(title=f'Новость {i}', text='Текст') for i in range(request.param)
+    )
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Комментарий {i}')
+        for i in range(request.param)
+    )
+    return request.param
+
+
+@pytest.fixture
+def route_args(news, comment):
+    """Аргументы для построения адреса каждого маршрута."""
+    return {
+        'news:detail': (news.pk,),
+        'news:detail_async': (news.pk,),
+        'news:comments': (news.pk,),
+        'news:feed': ('day',),
+        'news:api_comments': (news.pk,),
+        'news:edit': (comment.pk,),
+        'news:delete': (comment.pk,),
+    }
+
+
+@pytest.fixture
+def route_query():
+    """GET-параметры маршрутов, без которых страница не делает работу."""
+    return {
+        'news:search': {'q': 'Новость'},
+    }
+
+
+def test_every_route_has_query_budget():
+    """Для каждого маршрута объявлен бюджет запросов."""
+    routes = set(route_names(get_resolver().url_patterns))
+    assert routes == set(QUERY_BUDGETS)
+
+
+@pytest.mark.parametrize('url_name', sorted(QUERY_BUDGETS))
+def test_route_query_budget(
+        url_name, many_rows, route_args, route_query, author_client,
+        query_budget
+):
+    """
+    Число запросов маршрута не превышает бюджет при любом объёме.
+
+    Потоковый ответ читается внутри замера: его строки выбираются
+    из базы только при чтении тела.
+    """
+    url = reverse(url_name, args=route_args.get(url_name, ()))
+    with query_budget(url_name):
+        response = author_client.get(url, route_query.get(url_name))
+        if response.streaming:
+            b''.join(response.streaming_content)
@@ -0,0 +1,99 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from news.models import Comment, News, NewsRanking
+from news.rankings import refresh_feed
+
+pytestmark = pytest.mark.django_db
+
+Feed = NewsRanking.Feed
+
+
+@pytest.fixture
+def activity(author):
+    """
+    Три новости с комментариями разной давности.
+
+    За час обсуждали только первую, за сутки больше всех вторую,
+    за неделю больше всех третью.
+    """
+    first, second, third = (
+        News.objects.create(title=f'Новость {i}', text='Текст')
+        for i in range(3)
+    )
+    now = timezone.now()
+    ages = (
+        (first, timedelta(minutes=10), 1),
+        (second, timedelta(hours=5), 2),
+        (third, timedelta(days=3), 3),
+    )
+    for news, age, count in ages:
+        Comment.objects.bulk_create(
+            Comment(news=news, author=author, text='Текст')
+            for _ in range(count)
+        )
+        Comment.objects.filter(news=news).update(created=now - age)
+    News.objects.reconcile_comment_counts()
+    return first, second, third
+
+
+def feed_ids(feed):
+    return list(
+        NewsRanking.objects.filter(feed=feed).values_list('news', flat=True)
+    )
+
+
+def test_refresh_rankings_windows(activity):
+    """Ленты ранжируют новости по комментариям за своё окно."""
+    first, second, third = activity
+    call_command('refresh_rankings', stdout=StringIO())
+    assert feed_ids(Feed.HOUR) == [first.pk]
+    assert feed_ids(Feed.DAY) == [second.pk, first.pk]
+    assert feed_ids(Feed.WEEK) == [third.pk, second.pk, first.pk]
+    assert feed_ids(Feed.DISCUSSED) == [third.pk, second.pk, first.pk]
+
+
+def test_refresh_skips_unchanged_feeds(activity, author):
+    """Неизменившаяся лента не перезаписывается."""
+    assert refresh_feed(Feed.HOUR, size=10)
+    assert not refresh_feed(Feed.HOUR, size=10)
+    Comment.objects.create(news=activity[1], author=author, text='Текст')
+    Comment.objects.create(news=activity[1], author=author, text='Текст')
+    assert refresh_feed(Feed.HOUR, size=10)
+    assert feed_ids(Feed.HOUR) == [activity[1].pk, activity[0].pk]
+
+
+def test_refresh_rankings_size(activity):
+    """Лента содержит не больше --size новостей."""
+    stdout = StringIO()
+    call_command(
+        'refresh_rankings', feed=[Feed.WEEK], size=2, stdout=stdout
+    )
+    assert feed_ids(Feed.WEEK) == [activity[2].pk, activity[1].pk]
+    assert not feed_ids(Feed.DAY)
+    assert 'Лента week: обновлена' in stdout.getvalue()
+
+
+def test_feed_page_single_query(
+        client, activity, django_assert_num_queries
+):
+    """Страница ленты читает готовые позиции одним запросом."""
+    call_command('refresh_rankings', stdout=StringIO())
+    url = reverse('news:feed', args=(Feed.WEEK,))
+    with django_assert_num_queries(1):
+        response = client.get(url)
+    rankings = response.context['rankings']
+    assert [ranking.news for ranking in rankings] == list(activity[::-1])
+    assert [ranking.score for ranking in rankings] == [3, 2, 1]
+
+
+def test_unknown_feed_not_found(client):
+    """Неизвестная лента приводит к 404."""
+    response = client.get(reverse('news:feed', args=('month',)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
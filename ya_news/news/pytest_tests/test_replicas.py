@@ -0,0 +1,120 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from news.models import Comment, News
+from yanews.replicas import PIN_COOKIE, PRIMARY, ReplicaRouter, routing
+from .conftest import file_database
+from .test_async import asgi_get
+
+pytestmark = pytest.mark.django_db
+
+REPLICA = 'replica'
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """Реплика в отдельном файле SQLite, отстающая от основной базы."""
+    with file_database(REPLICA, tmp_path / 'replica.sqlite3'):
+        settings.DATABASE_REPLICAS = [REPLICA]
+        yield REPLICA
+
+
+@pytest.fixture
+def stale_news(replica, news):
+    """Та же новость на реплике, но в устаревшей редакции."""
+    return News.objects.using(replica).create(
+        pk=news.pk, title='Устаревший заголовок', text=news.text
+    )
+
+
+def test_listed_views_read_from_replica(client, stale_news):
+    """Страницы из DATABASE_REPLICA_VIEWS читают с реплики."""
+    response = client.get(reverse('news:archive'))
+    assert [news.title for news in response.context['page'].object_list] == [
+        stale_news.title
+    ]
+
+
+def test_async_views_read_from_replica(stale_news):
+    """Под ASGI состояние запроса доходит до потока с ORM."""
+    url = reverse('news:detail_async', args=(stale_news.pk,))
+    # Страница с параметрами не кешируется и читается с реплики.
+    response = asgi_get(f'{url}?page=1')
+    assert response.context['news'].title == stale_news.title
+
+
+@pytest.mark.parametrize('name', ('news:home', 'news:home_async'))
+def test_home_page_read_from_primary(client, stale_news, news, name):
+    """Общий для всех фрагмент главной не заполняется с реплики."""
+    content = asgi_get(reverse(name)).content.decode()
+    assert news.title in content
+    assert stale_news.title not in content
+    assert stale_news.title not in client.get(reverse(name)).content.decode()
+
+
+@pytest.mark.parametrize('name', ('news:detail', 'news:detail_async'))
+def test_cached_page_read_from_primary(client, stale_news, news, name):
+    """Страница для кеша анонимов не читается с отстающей реплики."""
+    url = reverse(name, args=(news.pk,))
+    assert asgi_get(url).context['news'].title == news.title
+    assert client.get(url).content.decode().count(stale_news.title) == 0
+
+
+def stream_results(response):
+    return json.loads(b''.join(response.streaming_content))['results']
+
+
+def test_api_streams_from_replica(client, stale_news):
+    """Тело потокового ответа API тоже читается с реплики."""
+    response = client.get(reverse('news:api_news'), {'fields': 'title'})
+    assert stream_results(response) == [{'title': stale_news.title}]
+
+
+def test_api_comments_read_from_replica(client, stale_news, comment):
+    """Новость и её комментарии читаются с одной реплики."""
+    url = reverse('news:api_comments', args=(stale_news.pk,))
+    assert stream_results(client.get(url)) == []
+
+
+def test_other_views_read_from_primary(client, replica, news, url_comments):
+    """Остальные страницы читают из основной базы."""
+    assert client.get(url_comments).context['news'] == news
+
+
+def test_redirect_after_comment_reads_primary(
+        author_client, stale_news, news, url_detail, form_data
+):
+    """После отправки комментария клиент читает из основной базы."""
+    response = author_client.post(url_detail, form_data, follow=True)
+    assert response.redirect_chain
+    assert response.context['news'].title == news.title
+    assert [comment.text for comment in response.context[
+        'comments'
+    ].object_list] == [form_data['text']]
+    assert Comment.objects.using(stale_news._state.db).count() == 0
+
+
+def test_write_sets_pin_cookie(settings, author_client, replica, url_detail,
+                               form_data):
+    """Ответ на запрос с записью закрепляет клиента за основной базой."""
+    response = author_client.post(url_detail, form_data)
+    cookie = response.cookies[PIN_COOKIE]
+    assert cookie['max-age'] == settings.DATABASE_PIN_SECONDS
+    assert cookie['httponly']
+
+
+def test_write_pins_rest_of_request(replica):
+    """После записи остаток запроса читает из основной базы."""
+    router = ReplicaRouter()
+    with routing(replica):
+        assert router.db_for_read(News) == replica
+        router.db_for_write(News)
+        assert router.db_for_read(News) is None
+
+
+def test_replica_object_saved_to_primary(stale_news):
+    """Объект, прочитанный с реплики, записывается в основную базу."""
+    router = ReplicaRouter()
+    assert router.db_for_write(News, instance=stale_news) == PRIMARY
@@ -0,0 +1,90 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from news.models import News
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def url_search():
+    """Адрес поиска по новостям."""
+    return reverse('news:search')
+
+
+@pytest.fixture
+def archive():
+    """Новости для поиска."""
+    return [
+        News.objects.create(
+            title='Запуск ракеты', text='Ракета стартовала с космодрома.'
+        ),
+        News.objects.create(
+            title='Футбол', text='Матч закончился <b>вничью</b>, ракеты нет.'
+        ),
+        News.objects.create(title='Погода', text='Завтра дождь.'),
+    ]
+
+
+def test_search_finds_news_with_highlight(client, url_search, archive):
+    """Поиск находит новости и подсвечивает совпадения."""
+    response = client.get(url_search, {'q': 'ракет'})
+    results = response.context['results']
+    assert [result.news for result in results] == archive[:2]
+    assert results[0].title == 'Запуск <mark>ракеты</mark>'
+    assert '<mark>Ракета</mark>' in results[0].snippet
+
+
+def test_search_escapes_news_text(client, url_search, archive):
+    """Текст новости во фрагменте экранируется."""
+    response = client.get(url_search, {'q': 'вничью'})
+    snippet = response.context['results'][0].snippet
+    assert '&lt;b&gt;<mark>вничью</mark>&lt;/b&gt;' in snippet
+
+
+def test_search_pagination(client, settings, url_search, archive):
+    """Результаты выводятся страницами."""
+    settings.NEWS_SEARCH_PER_PAGE = 1
+    first = client.get(url_search, {'q': 'ракет'}).context
+    second = client.get(url_search, {'q': 'ракет', 'page': 2}).context
+    assert first['has_next'] and not second['has_next']
+    assert first['results'][0].news != second['results'][0].news
+
+
+def test_search_index_follows_updates(client, url_search, archive):
+    """Индекс обновляется при изменении и удалении новостей."""
+    weather = archive[2]
+    weather.text = 'Завтра снег.'
+    weather.save()
+    assert not client.get(url_search, {'q': 'дождь'}).context['results']
+    assert client.get(url_search, {'q': 'снег'}).context['results']
+    weather.delete()
+    assert not client.get(url_search, {'q': 'снег'}).context['results']
+
+
+@pytest.mark.parametrize(
+    'page', ('0', '-1', 'два', '²', '51', '999999999999999999', '9' * 30)
+)
+def test_search_invalid_page(client, url_search, page):
+    """Некорректный номер страницы приводит к 404."""
+    response = client.get(url_search, {'q': 'ракета', 'page': page})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_search_last_page(client, url_search, settings):
+    """Последняя разрешённая страница поиска открывается."""
+    response = client.get(
+        url_search, {'q': 'ракета', 'page': settings.NEWS_SEARCH_MAX_PAGE}
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_seed_news_command(client, url_search):
+    """Команда заполняет базу новостями, доступными для поиска."""
+    call_command('seed_news', count=30, batch_size=7, stdout=StringIO())
+    assert News.objects.count() == 30
+    assert client.get(url_search, {'q': 'город'}).context['results']
@@ -0,0 +1,78 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connections, transaction
+
+from news.models import Comment, News
+from .conftest import file_database
+
+ALIAS = 'stress'
+THREADS = 8
+POSTS_PER_THREAD = 25
+
+
+@pytest.fixture
+def stress_db(tmp_path, django_db_blocker):
+    """Файловая база с профилем tuned: общая для всех потоков."""
+    with django_db_blocker.unblock():
+        with file_database(ALIAS, tmp_path / 'stress.sqlite3'):
+            yield ALIAS
+
+
+def post_comments(barrier, news_pk, author_pk):
+    """
+    Публикует комментарии из отдельного потока.
+
+    Транзакция сначала читает новость, а потом пишет: это тот случай,
+    когда SQLite по умолчанию отвечает «database is locked».
+    """
+    errors = 0
+    barrier.wait()
+    try:
+        for number in range(POSTS_PER_THREAD):
+            try:
+                with transaction.atomic(using=ALIAS):
+                    news = News.objects.using(ALIAS).get(pk=news_pk)
+                    Comment.objects.using(ALIAS).create(
+                        news=news, author_id=author_pk,
+                        text=f'Комментарий {number}',
+                    )
+            except OperationalError:
+                errors += 1
+    finally:
+        connections[ALIAS].close()
+    return errors
+
+
+def test_tuned_profile_pragmas(stress_db):
+    """Подключение настраивается PRAGMA из профиля."""
+    expected = {
+        'journal_mode': 'wal',
+        'synchronous': 1,
+        'busy_timeout': 5000,
+        'cache_size': -64 * 1024,
+    }
+    with connections[stress_db].cursor() as cursor:
+        for pragma, value in expected.items():
+            cursor.execute(f'PRAGMA {pragma}')
+            assert cursor.fetchone()[0] == value, pragma
+
+
+def test_parallel_comments_do_not_fail(stress_db):
+    """Параллельная публикация комментариев проходит без ошибок."""
+    author = get_user_model().objects.using(stress_db).create(
+        username='Автор'
+    )
+    news = News.objects.using(stress_db).create(title='Новость', text='Текст')
+    barrier = threading.Barrier(THREADS)
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        errors = list(pool.map(
+            lambda _: post_comments(barrier, news.pk, author.pk),
+            range(THREADS)
+        ))
+    assert sum(errors) == 0
+    assert Comment.objects.using(stress_db).count() == (
+        THREADS * POSTS_PER_THREAD
+    )
@@ -0,0 +1,17 @@
+from django.template import engines
+
+from yanews.settings import prod
+from yanews.warmup import warm_up_templates
+
+
+def test_warm_up_fills_template_cache(settings):
+    """Прогрев компилирует все шаблоны из templates/ в кеш загрузчика."""
+    settings.TEMPLATES = prod.TEMPLATES
+    directory = settings.BASE_DIR / 'templates'
+    names = {
+        path.relative_to(directory).as_posix()
+        for path in directory.rglob('*.html')
+    }
+    assert warm_up_templates() == len(names)
+    loader, = engines['django'].engine.template_loaders
+    assert set(loader.get_template_cache) >= names
@@ -0,0 +1,60 @@
+"""
+Заранее рассчитанные ленты новостей.
+
+Ленты «обсуждают сейчас» ранжируют новости по числу комментариев
+за скользящее окно (час, сутки, неделя), лента «самые обсуждаемые» —
+по общему числу комментариев. Каждая лента пересчитывается одним
+запросом с группировкой и хранится в NewsRanking, поэтому страница
+ленты не считает ничего при запросе. Неизменившиеся ленты
+не перезаписываются.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Comment, News, NewsRanking
+
+Feed = NewsRanking.Feed
+
+WINDOWS = {
+    Feed.HOUR: timedelta(hours=1),
+    Feed.DAY: timedelta(days=1),
+    Feed.WEEK: timedelta(days=7),
+}
+
+
+def compute_feed(feed, size, now=None):
+    """Пары (id новости, очки) для ленты feed в порядке убывания очков."""
+    if feed == Feed.DISCUSSED:
+        rows = News.objects.filter(comment_count__gt=0).order_by(
+            '-comment_count', '-pk'
+        ).values_list('pk', 'comment_count')
+    else:
+        since = (now or timezone.now()) - WINDOWS[feed]
+        rows = Comment.objects.filter(created__gte=since).order_by().values(
+            'news'
+        ).annotate(
+            score=Count('pk')
+        ).order_by('-score', '-news').values_list('news', 'score')
+    return list(rows[:size])
+
+
+def refresh_feed(feed, size, now=None):
+    """
+    Пересчитывает ленту feed.
+
+    Возвращает True, если лента изменилась и была перезаписана.
+    """
+    ranked = compute_feed(feed, size, now)
+    stored = NewsRanking.objects.filter(feed=feed)
+    with transaction.atomic():
+        if list(stored.values_list('news', 'score')) == ranked:
+            return False
+        stored.delete()
+        NewsRanking.objects.bulk_create(
+            NewsRanking(feed=feed, position=position, news_id=pk, score=score)
+            for position, (pk, score) in enumerate(ranked, start=1)
+        )
+    return True
@@ -0,0 +1,120 @@
+"""
+Полнотекстовый поиск по архиву новостей.
+
+На SQLite используется виртуальная таблица FTS5 news_news_fts
+с внешним содержимым: она хранит только индекс по title и text,
+а триггеры поддерживают его при вставке, изменении и удалении новостей.
+Фрагменты с подсветкой строит сам FTS5 (функции highlight и snippet).
+На других СУБД поиск откатывается к icontains.
+"""
+import re
+from dataclasses import dataclass
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+FTS_TABLE = 'news_news_fts'
+
+# Управляющие символы не встречаются в тексте новостей, поэтому
+# ими можно отметить совпадения, а после экранирования заменить на <mark>.
+MARK_START = '\x02'
+MARK_END = '\x03'
+SNIPPET_TOKENS = 24
+
+SEARCH_SQL = f"""
+    SELECT
+        rowid,
+        highlight({FTS_TABLE}, 0, %s, %s),
+        snippet({FTS_TABLE}, 1, %s, %s, '…', {SNIPPET_TOKENS})
+    FROM {FTS_TABLE}
+    WHERE {FTS_TABLE} MATCH %s
+    ORDER BY rank
+    LIMIT %s OFFSET %s
+"""
+
+
+@dataclass
+class SearchResult:
+    news: object
+    title: str
+    snippet: str
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text)
+
+
+def fts_query(terms):
+    """
+    Запрос FTS5 из слов пользователя.
+
+    Каждое слово берётся в кавычки, чтобы операторы FTS5 в тексте
+    не ломали запрос, и ищется по префиксу.
+    """
+    return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def marked_html(text):
+    """Экранирует текст и превращает отметки совпадений в <mark>."""
+    return mark_safe(escape(text).replace(
+        MARK_START, '<mark>'
+    ).replace(MARK_END, '</mark>'))
+
+
+def _fts_search(queryset, terms, offset, limit):
+    with connection.cursor() as cursor:
+        cursor.execute(SEARCH_SQL, (
+            MARK_START, MARK_END, MARK_START, MARK_END,
+            fts_query(terms), limit, offset,
+        ))
+        rows = cursor.fetchall()
+    news = queryset.only('id', 'title', 'date').in_bulk(
+        [row[0] for row in rows]
+    )
+    return [
+        SearchResult(news[pk], marked_html(title), marked_html(snippet))
+        for pk, title, snippet in rows if pk in news
+    ]
+
+
+def _mark_terms(text, terms):
+    pattern = '|'.join(re.escape(term) for term in terms)
+    return re.sub(
+        pattern, lambda match: MARK_START + match[0] + MARK_END,
+        text, flags=re.IGNORECASE
+    )
+
+
+def _fallback_search(queryset, terms, offset, limit):
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(text__icontains=term)
+    found = queryset.filter(condition).order_by('-date', '-id')
+    return [
+        SearchResult(
+            news,
+            marked_html(_mark_terms(news.title, terms)),
+            marked_html(_mark_terms(
+                Truncator(news.text).words(SNIPPET_TOKENS, truncate='…'),
+                terms
+            )),
+        )
+        for news in found[offset:offset + limit]
+    ]
+
+
+def search_news(queryset, text, offset, limit):
+    """
+    Новости, подходящие под запрос, с подсвеченными фрагментами.
+
+    Результаты FTS5 упорядочены по bm25; без FTS5 — от новых к старым.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+    if connection.vendor == 'sqlite':
+        return _fts_search(queryset, terms, offset, limit)
+    return _fallback_search(queryset, terms, offset, limit)
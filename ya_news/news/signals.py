@@ -0,0 +1,88 @@
+from contextvars import ContextVar
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from . import cache
+from .models import Comment, News, make_excerpt
+
+
+@receiver(pre_save, sender=News)
+def fill_excerpt(sender, instance, **kwargs):
+    """
+    Начало новости для списков.
+
+    Заполняется и при сохранении с raw=True (loaddata), которое
+    обходит News.save().
+    """
+    instance.excerpt = make_excerpt(instance.text)
+
+
+# Версии увеличиваются только после фиксации транзакции. Иначе читатель
+# между сигналом и фиксацией прочитал бы ещё старые строки и сохранил
+# страницу под новой версией, и она жила бы в кеше до следующей правки.
+@receiver((post_save, post_delete), sender=News)
+def invalidate_news_pages(sender, instance, using, **kwargs):
+    """Изменилась новость: сбрасываем главную и страницу новости."""
+    transaction.on_commit(
+        partial(cache.invalidate_news_pages, instance.pk), using
+    )
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comment_pages(sender, instance, using, **kwargs):
+    """Изменился комментарий: меняется счётчик на главной и ветка."""
+    if is_news_deleted(using, instance.news_id):
+        return
+    transaction.on_commit(
+        partial(cache.invalidate_news_pages, instance.news_id), using
+    )
+
+
+# Комментарии удаляемой новости Django удаляет каскадом, и для каждого
+# приходит post_delete. Сдвигать счётчик и сбрасывать кеш для строки,
+# которая удаляется в той же операции, незачем: на новость с сотнями
+# комментариев это сотни UPDATE. Поэтому удаляемые новости отмечаются
+# в pre_delete (он приходит до удаления любых строк), а страницы
+# сбрасывает один post_delete самой новости.
+deleted_news = ContextVar('deleted_news', default=frozenset())
+
+
+def is_news_deleted(using, news_pk):
+    return (using, news_pk) in deleted_news.get()
+
+
+@receiver(pre_delete, sender=News)
+def mark_deleted_news(sender, instance, using, **kwargs):
+    deleted_news.set(deleted_news.get() | {(using, instance.pk)})
+
+
+@receiver(post_delete, sender=News)
+def unmark_deleted_news(sender, instance, using, **kwargs):
+    deleted_news.set(deleted_news.get() - {(using, instance.pk)})
+
+
+# Счётчик сдвигается в той же транзакции, что и запись комментария,
+# если она есть: при удалении её открывает сам Django, при создании —
+# вызывающий код. Так счётчик ведут и представления, и админка, и shell.
+@receiver(post_save, sender=Comment)
+def count_created_comment(sender, instance, created, raw, using, **kwargs):
+    """Новый комментарий увеличивает счётчик новости."""
+    if created and not raw:
+        News.objects.using(using).filter(
+            pk=instance.news_id
+        ).change_comment_count(1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, using, **kwargs):
+    """Удалённый комментарий уменьшает счётчик новости."""
+    if is_news_deleted(using, instance.news_id):
+        return
+    News.objects.using(using).filter(
+        pk=instance.news_id
+    ).change_comment_count(-1)
@@ -1,15 +1,50 @@
 from django.urls import path
-from news import views
+from news import api, views
 
 app_name = 'news'
 
 urlpatterns = [
     path('', views.NewsList.as_view(), name='home'),
+    path('search/', views.NewsSearch.as_view(), name='search'),
+    path('feed/<slug:feed>/', views.NewsFeed.as_view(), name='feed'),
+    path('archive/', views.NewsArchive.as_view(), name='archive'),
+    path(
+        'archive/<int:year>/',
+        views.NewsArchive.as_view(),
+        name='archive'
+    ),
+    path(
+        'archive/<int:year>/<int:month>/',
+        views.NewsArchive.as_view(),
+        name='archive'
+    ),
+    path(
+        'archive/<int:year>/<int:month>/<int:day>/',
+        views.NewsArchive.as_view(),
+        name='archive'
+    ),
     path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
+    path(
+        'news/<int:pk>/comments/',
+        views.NewsCommentsPage.as_view(),
+        name='comments'
+    ),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
         name='delete'
     ),
     path('edit_comment/<int:pk>/', views.CommentUpdate.as_view(), name='edit'),
+    path('api/news/', api.NewsListApi.as_view(), name='api_news'),
+    path(
+        'api/news/<int:pk>/comments/',
+        api.CommentListApi.as_view(),
+        name='api_comments'
+    ),
+    path('async/', views.news_list_async, name='home_async'),
+    path(
+        'async/news/<int:pk>/',
+        views.news_detail_async,
+        name='detail_async'
+    ),
 ]
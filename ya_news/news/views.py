@@ -1,11 +1,22 @@
+import calendar
+from datetime import date, timedelta
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.http import Http404, HttpResponseNotAllowed
+from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
 from django.views import generic
 
+from yanews import replicas
+
+from . import cache, conditional
 from .forms import CommentForm
-from .models import Comment, News
+from .models import Comment, News, NewsRanking
+from .pagination import InvalidCursor, KeysetPaginator
+from .search import search_news
 
 
 class NewsList(generic.ListView):
@@ -18,29 +29,258 @@ class NewsList(generic.ListView):
         Выводим только несколько последних новостей.
 
         Их количество определяется в настройках проекта.
+        Число комментариев хранится в самой новости (comment_count),
+        поэтому комментарии не соединяются и не группируются. Вместо
+        полного текста читается сохранённое начало новости (excerpt).
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
+        return self.model.objects.defer(
+            'text'
         )[:settings.NEWS_COUNT_ON_HOME_PAGE]
 
+    def get_context_data(self, **kwargs):
+        """
+        Параметры кеша списка новостей.
+
+        Шаблон кеширует отрисованный список по версии, которую
+        увеличивают сигналы при записи новостей и комментариев;
+        при попадании в кеш запрос к базе не выполняется.
+        """
+        context = super().get_context_data(**kwargs)
+        context.update(
+            cache_alias=settings.NEWS_CACHE_ALIAS,
+            cache_timeout=settings.NEWS_HOME_CACHE_TIMEOUT,
+            cache_version=cache.home_page_version(),
+            feeds=NewsRanking.Feed,
+        )
+        return context
+
+
+class NewsSearch(generic.TemplateView):
+    """
+    Поиск по архиву новостей.
+
+    Результаты выводятся страницами по релевантности, совпадения
+    в заголовке и фрагменте текста подсвечены.
+    """
+    template_name = 'news/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '')
+        try:
+            page = int(self.request.GET.get('page', '1'))
+        except ValueError:
+            raise Http404('Некорректный номер страницы.')
+        if not 1 <= page <= settings.NEWS_SEARCH_MAX_PAGE:
+            raise Http404('Некорректный номер страницы.')
+        per_page = settings.NEWS_SEARCH_PER_PAGE
+        results = search_news(
+            News.objects.all(), query, (page - 1) * per_page, per_page + 1
+        )
+        context.update(
+            query=query,
+            results=results[:per_page],
+            page=page,
+            has_next=len(results) > per_page,
+        )
+        return context
+
+
+class NewsFeed(generic.ListView):
+    """
+    Лента обсуждаемых новостей.
+
+    Ленты рассчитывает команда refresh_rankings, страница читает готовые
+    позиции вместе с новостями одним запросом по индексу ленты.
+    """
+    template_name = 'news/feed.html'
+    context_object_name = 'rankings'
+
+    def get_queryset(self):
+        feed = self.kwargs['feed']
+        if feed not in NewsRanking.Feed.values:
+            raise Http404('Такой ленты нет.')
+        return NewsRanking.objects.filter(feed=feed).select_related(
+            'news'
+        ).defer('news__text')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(
+            feed=NewsRanking.Feed(self.kwargs['feed']),
+            feeds=NewsRanking.Feed,
+        )
+        return context
+
+
+class NewsArchive(generic.TemplateView):
+    """
+    Архив новостей по годам, месяцам и дням.
+
+    Период задаётся диапазоном дат, а новости внутри него листаются
+    по ключу (date, id) с индексом news_date_id_idx, поэтому любая
+    страница архива стоит столько же, сколько первая.
+    """
+    template_name = 'news/archive.html'
+
+    def get_period(self):
+        """Границы [начало, конец) выбранного периода или None."""
+        year = self.kwargs.get('year')
+        month = self.kwargs.get('month')
+        day = self.kwargs.get('day')
+        try:
+            if day is not None:
+                start = date(year, month, day)
+                return start, start + timedelta(days=1)
+            if month is not None:
+                start = date(year, month, 1)
+                days = calendar.monthrange(year, month)[1]
+                return start, start + timedelta(days=days)
+            if year is not None:
+                return date(year, 1, 1), date(year + 1, 1, 1)
+        except (ValueError, OverflowError):
+            raise Http404('Некорректная дата.')
+        return None
+
+    def get_subperiods(self, period):
+        """Даты начала вложенных периодов для навигации."""
+        if period is None:
+            dates = News.objects.order_by('date').values_list(
+                'date', flat=True
+            )
+            first, last = dates.first(), dates.reverse().first()
+            if first is None:
+                return []
+            return [
+                date(year, 1, 1)
+                for year in range(last.year, first.year - 1, -1)
+            ]
+        start, end = period
+        if 'day' in self.kwargs:
+            return []
+        if 'month' in self.kwargs:
+            return [
+                start + timedelta(days=offset)
+                for offset in range((end - start).days)
+            ]
+        return [date(start.year, month, 1) for month in range(1, 13)]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        period = self.get_period()
+        queryset = News.objects.defer('text')
+        if period is not None:
+            queryset = queryset.filter(
+                date__gte=period[0], date__lt=period[1]
+            )
+        paginator = KeysetPaginator(
+            queryset,
+            ordering=('-date', '-id'),
+            per_page=settings.NEWS_ARCHIVE_PER_PAGE,
+        )
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Некорректный курсор.')
+        context.update(
+            page=page,
+            period_start=period and period[0],
+            subperiods=self.get_subperiods(period),
+        )
+        return context
+
+
+class CommentPageMixin:
+    """
+    Страница комментариев к новости.
+
+    Комментарии листаются по ключу (created, id): следующая страница
+    запрашивается по курсору из GET-параметра cursor.
+    """
+
+    def get_comments_page(self, news):
+        paginator = KeysetPaginator(
+            news.comment_set.select_related('author'),
+            ordering=('created', 'id'),
+            per_page=settings.COMMENTS_PER_PAGE,
+        )
+        try:
+            return paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Некорректный курсор.')
+
 
-class NewsDetail(generic.DetailView):
+class NewsDetail(CommentPageMixin, generic.DetailView):
     model = News
     template_name = 'news/detail.html'
 
-    def get_object(self, queryset=None):
-        return get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
+    def get(self, request, *args, **kwargs):
+        """
+        Анонимным читателям отдаём страницу из кеша.
+
+        Для них страница одинакова, а кеш сбрасывается сигналами
+        при любом изменении новости или комментариев к ней. Вместе
+        со страницей в кеше лежат её ETag и Last-Modified. Остальным
+        валидаторы читаются отдельным запросом, и если страница
+        у клиента не устарела, отвечаем 304 без загрузки новости
+        и отрисовки шаблона. Страница для кеша читается из основной
+        базы: с реплики в кеш попала бы устаревшая редакция.
+        """
+        pk = self.kwargs['pk']
+        cacheable = not (request.user.is_authenticated or request.GET)
+        key = cache.detail_page_key(pk)
+        if cacheable:
+            page = cache.get_cache().get(key)
+            if page is not None:
+                return conditional.cached_response(request, *page)
+            replicas.use_primary()
+        validators = conditional.page_validators(
+            pk, request.user.pk, request.GET.urlencode()
         )
+        if validators is None:
+            raise Http404('Новость не найдена.')
+        response = conditional.not_modified(request, *validators)
+        if response is not None:
+            return conditional.set_validators(response, *validators)
+
+        def store(response):
+            cache.get_cache().set(
+                key, (response.content, *validators),
+                settings.NEWS_DETAIL_CACHE_TIMEOUT
+            )
+
+        response = super().get(request, *args, **kwargs)
+        if cacheable:
+            response.add_post_render_callback(store)
+        return conditional.set_validators(response, *validators)
+
+    def get_object(self, queryset=None):
+        return get_object_or_404(self.model, pk=self.kwargs['pk'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context['comments'] = self.get_comments_page(self.object)
         if self.request.user.is_authenticated:
             context['form'] = CommentForm()
         return context
 
 
+class NewsCommentsPage(CommentPageMixin, generic.DetailView):
+    """Следующая страница комментариев HTML-фрагментом."""
+    model = News
+    template_name = 'news/includes/comments.html'
+
+    def get_object(self, queryset=None):
+        return get_object_or_404(
+            self.model.objects.only('id'), pk=self.kwargs['pk']
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments'] = self.get_comments_page(self.object)
+        return context
+
+
 class NewsComment(
         LoginRequiredMixin,
         generic.detail.SingleObjectMixin,
@@ -55,15 +295,22 @@ class NewsComment(
         return super().post(request, *args, **kwargs)
 
     def form_valid(self, form):
+        """
+        Комментарий и счётчик новости записываются вместе.
+
+        Счётчик сдвигает обработчик сигнала post_save.
+        """
         comment = form.save(commit=False)
         comment.news = self.object
         comment.author = self.request.user
-        comment.save()
+        with transaction.atomic():
+            comment.save()
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
@@ -82,14 +329,16 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
+        """Комментарий уже загружен представлением, повторно не читаем."""
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
         """Пользователь может работать только со своими комментариями."""
-        return self.model.objects.filter(author=self.request.user)
+        return self.model.objects.select_related('news').filter(
+            author=self.request.user
+        )
 
 
 class CommentUpdate(CommentBase, generic.UpdateView):
@@ -101,3 +350,97 @@ class CommentUpdate(CommentBase, generic.UpdateView):
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+
+
+# Асинхронные варианты страниц для ASGI. В Django 3.2 у ORM нет
+# асинхронного интерфейса, поэтому все обращения к базе, включая чтение
+# пользователя из сессии, выполняются за один переход в поток через
+# sync_to_async, а шаблон отрисовывается в цикле событий по уже
+# загруженным данным. Анонимную страницу новости из кеша можно отдать
+# вовсе без перехода в поток. Декораторы Django 3.2 с корутинами
+# не работают, поэтому метод запроса проверяется вручную.
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def _has_session(request):
+    """Без cookie сессии пользователь анонимный, база не нужна."""
+    return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def _load_user(request):
+    """Читает пользователя заранее: шаблону он нужен уже в цикле событий."""
+    return request.user.is_authenticated
+
+
+def _news_list_context(request):
+    """
+    Контекст главной.
+
+    Новости читаются всегда, даже если фрагмент списка есть в кеше:
+    фрагмент может быть вытеснен до отрисовки, а шаблон в цикле событий
+    не должен обращаться к базе. Это один запрос по индексу на несколько
+    новостей без текста.
+    """
+    view = NewsList()
+    view.setup(request)
+    view.object_list = list(view.get_queryset())
+    context = view.get_context_data()
+    _load_user(request)
+    return context
+
+
+def _news_detail_context(request, pk):
+    """
+    Валидаторы страницы и её контекст.
+
+    Контекст не собирается, если у клиента актуальная страница.
+    Страница, которая попадёт в кеш, читается из основной базы.
+    """
+    is_authenticated = _load_user(request)
+    if not (is_authenticated or request.GET):
+        replicas.use_primary()
+    validators = conditional.page_validators(
+        pk, request.user.pk, request.GET.urlencode()
+    )
+    if validators is None:
+        raise Http404('Новость не найдена.')
+    if conditional.not_modified(request, *validators) is not None:
+        return None, validators, is_authenticated
+    view = NewsDetail()
+    view.setup(request, pk=pk)
+    view.object = view.get_object()
+    context = view.get_context_data(object=view.object)
+    return context, validators, is_authenticated
+
+
+async def news_list_async(request):
+    """Асинхронный вариант NewsList."""
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    context = await sync_to_async(_news_list_context)(request)
+    return render(request, NewsList.template_name, context)
+
+
+async def news_detail_async(request, pk):
+    """Асинхронный вариант страницы новости, только для чтения."""
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    cacheable = not request.GET
+    key = cache.detail_page_key(pk)
+    if cacheable and not _has_session(request):
+        page = cache.get_cache().get(key)
+        if page is not None:
+            return conditional.cached_response(request, *page)
+    context, validators, is_authenticated = await sync_to_async(
+        _news_detail_context
+    )(request, pk)
+    if context is None:
+        response = conditional.not_modified(request, *validators)
+        return conditional.set_validators(response, *validators)
+    response = render(request, NewsDetail.template_name, context)
+    if cacheable and not is_authenticated:
+        cache.get_cache().set(
+            key, (response.content, *validators),
+            settings.NEWS_DETAIL_CACHE_TIMEOUT
+        )
+    return conditional.set_validators(response, *validators)
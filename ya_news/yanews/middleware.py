@@ -0,0 +1,233 @@
+"""
+Замер производительности запросов.
+
+PerformanceMiddleware для каждого запроса считает общее время, время
+и число SQL-запросов и время отрисовки шаблона. Результат отдаётся
+клиенту в заголовке Server-Timing и копится в гистограммах по имени
+маршрута; гистограммы периодически выгружаются в файл в текстовом
+формате Prometheus. Включается настройкой PERF_TIMING_ENABLED.
+
+Middleware работает и с синхронными, и с асинхронными представлениями.
+SQL замеряется обёрткой, которая ставится на каждое подключение к базе
+и находит замеры текущего запроса через contextvars: под ASGI запросы
+к базе выполняются в другом потоке, чем сам middleware.
+"""
+import asyncio
+import os
+import tempfile
+import threading
+from contextvars import ContextVar
+from time import monotonic, perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+METRIC_PREFIX = 'yanews'
+SECONDS_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+class MetricsRegistry:
+    """Гистограммы метрик по именам маршрутов, общие для процесса."""
+
+    METRICS = (
+        ('request_seconds', SECONDS_BUCKETS),
+        ('db_seconds', SECONDS_BUCKETS),
+        ('render_seconds', SECONDS_BUCKETS),
+        ('db_queries', QUERY_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, view, timing):
+        values = (timing.total, timing.db, timing.render, timing.queries)
+        with self._lock:
+            histograms = self._histograms.setdefault(view, [
+                Histogram(buckets) for _, buckets in self.METRICS
+            ])
+            for histogram, value in zip(histograms, values):
+                histogram.observe(value)
+
+    def get(self, view, metric):
+        names = [name for name, _ in self.METRICS]
+        return self._histograms[view][names.index(metric)]
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self):
+        """Все гистограммы в текстовом формате Prometheus."""
+        lines = []
+        with self._lock:
+            for index, (metric, _) in enumerate(self.METRICS):
+                name = f'{METRIC_PREFIX}_{metric}'
+                lines.append(f'# TYPE {name} histogram')
+                for view, histograms in sorted(self._histograms.items()):
+                    lines.extend(
+                        histograms[index].lines(name, f'view="{view}"')
+                    )
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """Атомарно записывает гистограммы в файл."""
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile(
+                'w', dir=directory, delete=False, encoding='utf-8'
+        ) as target:
+            target.write(self.render())
+        os.replace(target.name, path)
+
+
+registry = MetricsRegistry()
+current_timing = ContextVar('perf_timing', default=None)
+
+
+class RequestTiming:
+    """Замеры одного запроса, время в секундах."""
+
+    def __init__(self):
+        self.total = 0
+        self.db = 0
+        self.render = 0
+        self.queries = 0
+        self.started = None
+        self._render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """Замеряет выполнение одного SQL-запроса."""
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += perf_counter() - started
+            self.queries += 1
+
+    def render_started(self):
+        self._render_started = perf_counter()
+
+    def render_finished(self, response):
+        self.render += perf_counter() - self._render_started
+
+    def server_timing(self):
+        return ', '.join((
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries"',
+            f'render;dur={self.render * 1000:.2f}',
+            f'total;dur={self.total * 1000:.2f}',
+        ))
+
+
+def timed_execute(execute, sql, params, many, context):
+    """Обёртка выполнения SQL, передающая замер текущему запросу."""
+    timing = current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    return timing(execute, sql, params, many, context)
+
+
+def install_timing(connection, **kwargs):
+    """Ставит timed_execute на подключение к базе."""
+    if timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(timed_execute)
+
+
+class PerformanceMiddleware:
+    """Замеряет запрос и отдаёт замеры в Server-Timing и гистограммы."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PERF_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.dump_path = settings.PERF_TIMING_DUMP_PATH
+        self.dump_interval = settings.PERF_TIMING_DUMP_INTERVAL
+        self._dumped_at = monotonic()
+        # Новые подключения получают обёртку сразу, уже открытые —
+        # при первом синхронном запросе.
+        connection_created.connect(
+            install_timing, dispatch_uid='perf_install_timing'
+        )
+        if asyncio.iscoroutinefunction(self.get_response):
+            # Как в MiddlewareMixin: обработчик должен видеть,
+            # что экземпляр вызывается как корутина.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        for connection in connections.all():
+            install_timing(connection)
+        timing, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        return self.finish(request, response, timing)
+
+    def start(self, request):
+        timing = request.perf_timing = RequestTiming()
+        timing.started = perf_counter()
+        return timing, current_timing.set(timing)
+
+    def finish(self, request, response, timing):
+        timing.total = perf_counter() - timing.started
+        match = request.resolver_match
+        registry.observe(match.view_name if match else '<unresolved>', timing)
+        response['Server-Timing'] = timing.server_timing()
+        self.maybe_dump()
+        return response
+
+    def process_template_response(self, request, response):
+        """Отрисовка шаблона идёт после представления, замеряем её отдельно."""
+        request.perf_timing.render_started()
+        response.add_post_render_callback(request.perf_timing.render_finished)
+        return response
+
+    def maybe_dump(self):
+        if not self.dump_path:
+            return
+        now = monotonic()
+        if now - self._dumped_at >= self.dump_interval:
+            self._dumped_at = now
+            registry.dump(self.dump_path)
@@ -0,0 +1,177 @@
+"""
+Чтение с реплик базы данных.
+
+Реплики перечислены в DATABASE_REPLICAS. Читать с них разрешено только
+запросам к страницам из DATABASE_REPLICA_VIEWS: такие запросы отмечает
+ReplicaRoutingMiddleware, а ReplicaRouter по этой отметке выбирает базу.
+Любая запись и всё чтение после неё идут в основную базу default,
+поэтому код представлений о репликах ничего не знает.
+
+Реплика отстаёт от основной базы. Чтобы после отправки формы клиент
+сразу увидел свою запись, ответ на запрос с записью ставит cookie,
+и следующие DATABASE_PIN_SECONDS секунд этот клиент читает
+только из основной базы.
+"""
+import asyncio
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import Resolver404, resolve
+
+PRIMARY = 'default'
+PIN_COOKIE = 'db_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingState:
+    """Выбранная реплика и признак записи в рамках одного запроса."""
+
+    def __init__(self, replica=None):
+        self.replica = replica
+        self.wrote = False
+
+
+current_state = ContextVar('db_routing_state', default=None)
+
+
+@contextmanager
+def routing(replica=None):
+    """Состояние маршрутизации на время запроса."""
+    with activate(RoutingState(replica)) as state:
+        yield state
+
+
+@contextmanager
+def activate(state):
+    """Делает state текущим состоянием маршрутизации."""
+    token = current_state.set(state)
+    try:
+        yield state
+    finally:
+        current_state.reset(token)
+
+
+def routed_stream(content, state):
+    """
+    Части потокового ответа, прочитанные с состоянием запроса.
+
+    Тело такого ответа читается уже после выхода из middleware,
+    поэтому состояние восстанавливается на время каждой части.
+    """
+    iterator = iter(content)
+    while True:
+        with activate(state):
+            try:
+                part = next(iterator)
+            except StopIteration:
+                return
+        yield part
+
+
+def use_primary():
+    """
+    Оставшаяся часть запроса читает из основной базы.
+
+    Нужно, когда прочитанное переживёт запрос, например попадёт
+    в общий кеш: страница с отстающей реплики иначе осталась бы в нём
+    и после того, как реплика догонит основную базу.
+    """
+    state = current_state.get()
+    if state is not None:
+        state.replica = None
+
+
+class ReplicaRouter:
+    """
+    Читает с реплики текущего запроса, пишет в основную базу.
+
+    Вне отмеченных запросов у роутера нет мнения, и Django выбирает
+    базу как обычно: по объекту-подсказке или default.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = current_state.get()
+        if state is None or state.replica is None or state.wrote:
+            return None
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        """Объект, прочитанный с реплики, сохраняется в основную базу."""
+        state = current_state.get()
+        if state is not None:
+            state.wrote = True
+        instance = hints.get('instance')
+        if (instance is not None
+                and instance._state.db in settings.DATABASE_REPLICAS):
+            return PRIMARY
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Реплики — копии основной базы, связи между ними допустимы."""
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Отмечает запросы, которым можно читать с реплик."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.views = frozenset(settings.DATABASE_REPLICA_VIEWS)
+        if asyncio.iscoroutinefunction(self.get_response):
+            # Как в MiddlewareMixin: обработчик должен видеть,
+            # что экземпляр вызывается как корутина.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        with routing(self.choose_replica(request)) as state:
+            response = self.get_response(request)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        with routing(self.choose_replica(request)) as state:
+            response = await self.get_response(request)
+        return self.finish(request, response, state)
+
+    def finish(self, request, response, state):
+        if response.streaming:
+            response.streaming_content = routed_stream(
+                response.streaming_content, state
+            )
+        return self.pin(request, response, state)
+
+    def choose_replica(self, request):
+        """Реплика для чтения или None, если читать нужно из default."""
+        if request.method not in SAFE_METHODS:
+            return None
+        if PIN_COOKIE in request.COOKIES:
+            return None
+        try:
+            view_name = resolve(request.path_info).view_name
+        except Resolver404:
+            return None
+        if view_name not in self.views:
+            return None
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def pin(self, request, response, state):
+        """После записи клиент какое-то время читает из default."""
+        if state.wrote or request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.DATABASE_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,13 @@
+"""
+Настройки проекта по профилям.
+
+* base — общие настройки, минимальный набор приложений и слоёв;
+* dev — разработка: DEBUG, админка, сообщения, статика;
+* prod — production: кеш шаблонов, без лишних слоёв и процессоров;
+* bench — замеры производительности на отдельной базе.
+
+Профиль выбирается через DJANGO_SETTINGS_MODULE, например
+yanews.settings.prod. Сам пакет yanews.settings — это профиль dev,
+им пользуются manage.py и тесты.
+"""
+from .dev import *  # noqa: F401,F403
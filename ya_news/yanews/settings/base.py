@@ -0,0 +1,192 @@
+"""
+Общие настройки всех профилей.
+
+Здесь только то, что нужно для работы сайта: без админки, сообщений
+и статики, с минимальным набором промежуточных слоёв и контекстных
+процессоров. Профили dev, prod и bench дополняют или сужают эти
+настройки.
+"""
+import os
+from pathlib import Path
+
+from django.urls import reverse_lazy
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = 'django-insecure-7)dgs++2!#==aye4rd=5)c)bw0eokiyqx0hts6#t80!$c&$s+('
+
+DEBUG = False
+
+ALLOWED_HOSTS = ['localhost', '127.0.0.1']
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'news.apps.NewsConfig',
+]
+
+MIDDLEWARE = [
+    'yanews.middleware.PerformanceMiddleware',
+    'yanews.replicas.ReplicaRoutingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yanews.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.contrib.auth.context_processors.auth',
+            ],
+        },
+    },
+]
+
+# Компилировать все шаблоны из templates/ при старте процесса
+# (wsgi.py, asgi.py), см. профиль prod.
+TEMPLATES_WARM_UP = False
+
+WSGI_APPLICATION = 'yanews.wsgi.application'
+
+
+# Профиль базы данных выбирается переменной окружения DJANGO_DB_PROFILE.
+# default — SQLite с настройками по умолчанию, подключение открывается
+# заново на каждый запрос. tuned — журнал WAL (читатели не блокируют
+# писателя), ожидание блокировки вместо ошибки «database is locked»,
+# отображение файла в память, увеличенный кеш страниц и постоянные
+# подключения.
+DB_PROFILES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    'tuned': {
+        'ENGINE': 'yanews.sqlite',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'OPTIONS': {
+            'pragmas': {
+                # Первым, чтобы и переключение журнала ждало блокировку.
+                'busy_timeout': 5000,
+                'journal_mode': 'WAL',
+                # С WAL база переживает сбой целостной, теряются лишь
+                # последние транзакции; fsync на каждую не нужен.
+                'synchronous': 'NORMAL',
+                'mmap_size': 256 * 1024 * 1024,
+                # Отрицательное значение — размер в КиБ, здесь 64 МиБ.
+                'cache_size': -64 * 1024,
+            },
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+}
+DB_PROFILE = os.environ.get('DJANGO_DB_PROFILE', 'tuned')
+
+DATABASES = {
+    'default': DB_PROFILES[DB_PROFILE],
+}
+
+# Реплики только для чтения: пути к копиям файла базы через запятую
+# в DJANGO_DB_REPLICAS. Копии обновляет внешняя репликация (например,
+# Litestream); приложение только читает с них. С реплик читают страницы
+# из DATABASE_REPLICA_VIEWS, после записи клиент DATABASE_PIN_SECONDS
+# секунд читает из основной базы. Главной среди них нет: её список
+# попадает в общий для всех фрагмент кеша, и устаревшие строки
+# с реплики оставались бы в нём до таймаута.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+        filter(None, os.environ.get('DJANGO_DB_REPLICAS', '').split(',')),
+        start=1
+):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['yanews.replicas.ReplicaRouter']
+DATABASE_REPLICA_VIEWS = (
+    'news:detail',
+    'news:detail_async',
+    'news:feed',
+    'news:archive',
+    'news:api_news',
+    'news:api_comments',
+)
+DATABASE_PIN_SECONDS = 10
+
+
+# Кеш в памяти процесса: страницы и счётчики их версий у каждого
+# рабочего процесса свои. Подходит для разработки и тестов, в prod
+# кеш общий.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+AUTH_PASSWORD_VALIDATORS = []
+
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATIC_URL = '/static/'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+LOGIN_URL = reverse_lazy('users:login')
+LOGIN_REDIRECT_URL = reverse_lazy('news:home')
+
+NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_PER_PAGE = 20
+
+NEWS_SEARCH_PER_PAGE = 20
+# Дальние страницы поиска никто не листает, а OFFSET растёт с номером.
+NEWS_SEARCH_MAX_PAGE = 50
+
+NEWS_ARCHIVE_PER_PAGE = 20
+
+# JSON API: размер страницы по умолчанию, наибольший размер страницы
+# новостей и комментариев, размер порции чтения из базы.
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+API_MAX_COMMENTS_PAGE_SIZE = 5000
+API_CHUNK_SIZE = 500
+
+# Длина заранее рассчитанных лент, см. news.rankings.
+NEWS_RANKING_SIZE = 10
+
+NEWS_CACHE_ALIAS = 'default'
+NEWS_DETAIL_CACHE_TIMEOUT = 60 * 15
+NEWS_HOME_CACHE_TIMEOUT = 60 * 15
+
+# Файл со списком запрещённых слов, по одному в строке.
+# Если не задан, используется news.forms.BAD_WORDS.
+BAD_WORDS_FILE = None
+
+# Замер производительности запросов: заголовок Server-Timing
+# и гистограммы по маршрутам, выгружаемые в PERF_TIMING_DUMP_PATH.
+PERF_TIMING_ENABLED = os.environ.get('DJANGO_PERF_TIMING', '1') == '1'
+PERF_TIMING_DUMP_PATH = os.environ.get('DJANGO_PERF_TIMING_DUMP_PATH')
+PERF_TIMING_DUMP_INTERVAL = 60
@@ -0,0 +1,41 @@
+"""
+Настройки для замеров производительности.
+
+Профиль prod с постоянными условиями: отдельная база bench.sqlite3
+в профиле tuned без реплик, кеш в памяти процесса, без замера
+Server-Timing и выгрузки гистограмм. Переменные окружения
+DJANGO_DB_PROFILE, DJANGO_DB_REPLICAS, DJANGO_CACHE_DIR
+и DJANGO_PERF_TIMING здесь не действуют, так что прогоны на разных
+машинах и в разных оболочках сравнимы между собой.
+
+    DJANGO_SETTINGS_MODULE=yanews.settings.bench python manage.py migrate
+    DJANGO_SETTINGS_MODULE=yanews.settings.bench \
+        python -m benchmarks.async_views
+"""
+from .prod import *  # noqa: F401,F403
+from .prod import BASE_DIR, DB_PROFILES
+
+ALLOWED_HOSTS = ['localhost', '127.0.0.1', 'testserver']
+
+DB_PROFILE = 'tuned'
+DATABASES = {
+    'default': {
+        **DB_PROFILES[DB_PROFILE],
+        'NAME': BASE_DIR / 'bench.sqlite3',
+    },
+}
+DATABASE_REPLICAS = []
+
+# Хеширование паролей не должно влиять на замеры входа и сид данных.
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Замеры идут в одном процессе, и каждый прогон начинается с пустого
+# кеша, а не с файлов, оставшихся от прошлого.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+PERF_TIMING_ENABLED = False
+PERF_TIMING_DUMP_PATH = None
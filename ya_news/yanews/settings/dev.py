@@ -0,0 +1,45 @@
+"""
+Настройки для разработки.
+
+К общим настройкам добавляются DEBUG, админка, сообщения и раздача
+статики, а в шаблоны — переменные debug, request и messages.
+"""
+from .base import *  # noqa: F401,F403
+from .base import TEMPLATES
+
+DEBUG = True
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'news.apps.NewsConfig',
+]
+
+MIDDLEWARE = [
+    'yanews.middleware.PerformanceMiddleware',
+    'yanews.replicas.ReplicaRoutingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'context_processors': [
+            'django.template.context_processors.debug',
+            'django.template.context_processors.request',
+            'django.contrib.auth.context_processors.auth',
+            'django.contrib.messages.context_processors.messages',
+        ],
+    },
+}]
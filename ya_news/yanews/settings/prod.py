@@ -0,0 +1,53 @@
+"""
+Настройки для production.
+
+Приложения, промежуточные слои и контекстные процессоры — только
+из base: без админки, сообщений и статики анонимное чтение страниц
+проходит через меньшее число слоёв, а процесс быстрее импортируется
+и стартует.
+
+Шаблоны загружаются кеширующим загрузчиком: каждый файл читается
+и разбирается один раз за жизнь процесса, а не на каждый запрос.
+Все шаблоны из templates/ компилируются при старте процесса,
+поэтому и первые запросы не платят за разбор.
+
+Кеш страниц общий для всех рабочих процессов: правка в одном процессе
+сбрасывает страницу и у остальных.
+
+    DJANGO_SETTINGS_MODULE=yanews.settings.prod gunicorn yanews.wsgi
+"""
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, TEMPLATES
+
+DEBUG = False
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+TEMPLATES_WARM_UP = True
+
+# Версии страниц хранятся рядом со страницами, поэтому кеш в памяти
+# одного процесса не годится: комментарий сбросил бы страницу только
+# у процесса, который его принял, а ETag у процессов бы расходились.
+# Файловый кеш не требует отдельного сервера; каталог общий для всех
+# процессов на машине и задаётся DJANGO_CACHE_DIR.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'DJANGO_CACHE_DIR', str(BASE_DIR / 'cache')
+        ),
+    }
+}
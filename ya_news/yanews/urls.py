@@ -1,4 +1,4 @@
-from django.contrib import admin
+from django.apps import apps
 from django.contrib.auth import views as auth_views
 from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path
@@ -6,9 +6,14 @@ from django.views.generic import CreateView
 
 urlpatterns = [
     path('', include('news.urls')),
-    path('admin/', admin.site.urls),
 ]
 
+# Админка подключена только в профиле dev.
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns += [path('admin/', admin.site.urls)]
+
 auth_urls = ([
     path(
         'login/',
@@ -0,0 +1,21 @@
+"""Компиляция шаблонов при старте процесса."""
+from pathlib import Path
+
+from django.template import engines
+
+
+def warm_up_templates():
+    """
+    Загружает все шаблоны из каталогов DIRS каждого движка.
+
+    С кеширующим загрузчиком разобранные шаблоны остаются в памяти
+    процесса. Ошибка в шаблоне обнаруживается сразу при старте.
+    Возвращает число загруженных шаблонов.
+    """
+    count = 0
+    for engine in engines.all():
+        for directory in map(Path, engine.engine.dirs):
+            for path in sorted(directory.rglob('*.html')):
+                engine.get_template(path.relative_to(directory).as_posix())
+                count += 1
+    return count
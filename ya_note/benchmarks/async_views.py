@@ -0,0 +1,195 @@
+"""
+Нагрузочное сравнение синхронных и асинхронных страниц.
+
+Каждая страница прогоняется тремя способами при заданном числе
+одновременных соединений:
+
+* wsgi — синхронное представление под WSGI, пул потоков, как у
+  многопоточного WSGI-сервера;
+* asgi-sync — синхронное представление под ASGI: Django переводит
+  каждый запрос в поток;
+* asgi-async — асинхронный вариант представления под ASGI.
+
+ASGI-приложение вызывается напрямую из цикла событий, без сети, и служит
+локальной заменой uvicorn/daphne; так сравнивается сам Django, а не
+сервер. Запросы идут от пользователя benchmark, которому при первом
+запуске создаются заметки. Замеры идут в профиле yanote.settings.bench
+на отдельной базе bench.sqlite3. Из каталога ya_note:
+
+    export DJANGO_SETTINGS_MODULE=yanote.settings.bench
+    python manage.py migrate
+    python -m benchmarks.async_views --concurrency 128 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import django
+
+HOST = 'localhost'
+USERNAME = 'benchmark'
+
+
+def percentile(timings, share):
+    return timings[min(int(len(timings) * share), len(timings) - 1)]
+
+
+def report(name, timings, elapsed):
+    timings.sort()
+    print(f'{name:<28} {len(timings) / elapsed:>9.1f} '
+          f'{statistics.median(timings) * 1000:>9.2f} '
+          f'{percentile(timings, 0.99) * 1000:>9.2f}')
+
+
+def wsgi_environ(path, cookie):
+    return {
+        'HTTP_COOKIE': cookie,
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': HOST,
+        'SERVER_PORT': '80',
+        'HTTP_HOST': HOST,
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(),
+        'wsgi.errors': BytesIO(),
+    }
+
+
+def run_wsgi(application, path, cookie, concurrency, total):
+    def request(_):
+        statuses = []
+        started = time.perf_counter()
+        body = application(
+            wsgi_environ(path, cookie),
+            lambda status, headers: statuses.append(status),
+        )
+        b''.join(body)
+        body.close()
+        assert statuses[0].startswith('200'), statuses[0]
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = list(pool.map(request, range(total)))
+    return timings, time.perf_counter() - started
+
+
+async def asgi_request(application, path, cookie):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', HOST.encode()), (b'cookie', cookie.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': (HOST, 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    assert messages[0]['status'] == 200, messages[0]['status']
+    return time.perf_counter() - started
+
+
+async def run_asgi(application, path, cookie, concurrency, total):
+    remaining = iter(range(total))
+    timings = []
+
+    async def connection():
+        for _ in remaining:
+            timings.append(
+                await asgi_request(application, path, cookie)
+            )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(concurrency)))
+    return timings, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--concurrency', type=int, default=128)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--notes', type=int, default=1000)
+    options = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings.bench')
+    django.setup()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from django.test import Client
+    from django.urls import reverse
+
+    from notes.models import Note
+
+    settings.DEBUG = False
+    user, _ = get_user_model().objects.get_or_create(username=USERNAME)
+    existing = Note.objects.filter(author=user).count()
+    Note.objects.bulk_create(
+        Note(
+            title=f'Заметка {number}',
+            text='Текст заметки',
+            slug=f'{USERNAME}-{number}',
+            author=user,
+        )
+        for number in range(existing, options.notes)
+    )
+    note = Note.objects.filter(author=user).first()
+    client = Client()
+    client.force_login(user)
+    cookie = client.cookies[settings.SESSION_COOKIE_NAME].OutputString(
+        attrs=()
+    )
+    pages = (
+        ('список', 'notes:list', 'notes:list_async', {}),
+        ('заметка', 'notes:detail', 'notes:detail_async',
+         {'slug': note.slug}),
+    )
+    wsgi = get_wsgi_application()
+    asgi = get_asgi_application()
+    print(f'Соединений: {options.concurrency}, '
+          f'запросов на прогон: {options.requests}')
+    print(f'{"прогон":<28} {"запр./с":>9} {"p50, мс":>9} {"p99, мс":>9}')
+    for title, sync_name, async_name, kwargs in pages:
+        sync_path = reverse(sync_name, kwargs=kwargs)
+        async_path = reverse(async_name, kwargs=kwargs)
+        runs = (
+            ('wsgi', lambda: run_wsgi(
+                wsgi, sync_path, cookie,
+                options.concurrency, options.requests,
+            )),
+            ('asgi-sync', lambda: asyncio.run(run_asgi(
+                asgi, sync_path, cookie,
+                options.concurrency, options.requests,
+            ))),
+            ('asgi-async', lambda: asyncio.run(run_asgi(
+                asgi, async_path, cookie,
+                options.concurrency, options.requests,
+            ))),
+        )
+        for mode, run in runs:
+            report(f'{title}, {mode}', *run())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,3 @@
-from pytils.translit import slugify
-
 from django import forms
 from django.core.exceptions import ValidationError
 
@@ -16,14 +14,41 @@ class NoteForm(forms.ModelForm):
         fields = ('title', 'text', 'slug')
 
     def clean_slug(self):
-        """Обрабатывает случай, если slug не уникален."""
-        cleaned_data = super().clean()
-        slug = cleaned_data.get('slug')
+        """
+        Обрабатывает случай, если slug не уникален.
+
+        Пустой slug модель при сохранении заполнит свободным
+        вариантом из заголовка, проверять его здесь не нужно.
+        """
+        slug = self.cleaned_data.get('slug')
         if not slug:
-            title = cleaned_data.get('title')
-            slug = slugify(title)[:100]
+            return slug
         if Note.objects.filter(
                 slug=slug
         ).exclude(id=self.instance.pk).exists():
             raise ValidationError(slug + WARNING)
         return slug
+
+
+class NoteImportRowForm(NoteForm):
+    """
+    Проверка одной строки импорта.
+
+    Поля проверяются как в NoteForm, а уникальность slug проверяется
+    для всей пачки строк сразу, без запроса на каждую строку.
+    """
+
+    def clean_slug(self):
+        return self.cleaned_data.get('slug')
+
+    def validate_unique(self):
+        """Единственное уникальное поле, slug, проверяет импорт."""
+
+
+class NoteImportForm(forms.Form):
+    """Форма загрузки файла с заметками."""
+    file = forms.FileField(
+        label='Файл с заметками',
+        help_text=('NDJSON (один JSON-объект в строке) или CSV с заголовком; '
+                   'поля title, text и необязательное slug')
+    )
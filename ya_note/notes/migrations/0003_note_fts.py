@@ -0,0 +1,63 @@
+from django.db import migrations
+
+CREATE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS notes_note_fts USING fts5("
+    "title, text, author_id, content='notes_note', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    # Совпадения в заголовке весят больше, автор на ранжирование не влияет.
+    "INSERT INTO notes_note_fts (notes_note_fts, rank) "
+    "VALUES ('rank', 'bm25(10.0, 1.0, 0.0)')",
+    """CREATE TRIGGER IF NOT EXISTS notes_note_fts_insert
+    AFTER INSERT ON notes_note BEGIN
+        INSERT INTO notes_note_fts (rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS notes_note_fts_delete
+    AFTER DELETE ON notes_note BEGIN
+        INSERT INTO notes_note_fts (notes_note_fts, rowid, title, text,
+                                    author_id)
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS notes_note_fts_update
+    AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+        INSERT INTO notes_note_fts (notes_note_fts, rowid, title, text,
+                                    author_id)
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+        INSERT INTO notes_note_fts (rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END""",
+    "INSERT INTO notes_note_fts (notes_note_fts) VALUES ('rebuild')",
+)
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS notes_note_fts_insert',
+    'DROP TRIGGER IF EXISTS notes_note_fts_delete',
+    'DROP TRIGGER IF EXISTS notes_note_fts_update',
+    'DROP TABLE IF EXISTS notes_note_fts',
+)
+
+
+def run_sql(schema_editor, statements):
+    """FTS5 есть только в SQLite, на других СУБД поиск идёт по icontains."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_fts(apps, schema_editor):
+    run_sql(schema_editor, CREATE_SQL)
+
+
+def drop_fts(apps, schema_editor):
+    run_sql(schema_editor, DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_note_author_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
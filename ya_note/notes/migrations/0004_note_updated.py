@@ -0,0 +1,53 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+# Триггеры поиска в том виде, в каком их создала 0003_note_fts.
+CREATE_TRIGGERS_SQL = (
+    """CREATE TRIGGER IF NOT EXISTS notes_note_fts_insert
+    AFTER INSERT ON notes_note BEGIN
+        INSERT INTO notes_note_fts (rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS notes_note_fts_delete
+    AFTER DELETE ON notes_note BEGIN
+        INSERT INTO notes_note_fts (notes_note_fts, rowid, title, text,
+                                    author_id)
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS notes_note_fts_update
+    AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+        INSERT INTO notes_note_fts (notes_note_fts, rowid, title, text,
+                                    author_id)
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+        INSERT INTO notes_note_fts (rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END""",
+)
+
+
+def create_triggers(apps, schema_editor):
+    """Пересоздание таблицы на SQLite удаляет триггеры поиска."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_TRIGGERS_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0003_note_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, create_triggers),
+        migrations.AddField(
+            model_name='note',
+            name='updated',
+            field=models.DateTimeField(
+                auto_now=True, default=timezone.now, verbose_name='Изменена'
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(create_triggers, migrations.RunPython.noop),
+    ]
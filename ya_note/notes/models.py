@@ -1,8 +1,14 @@
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, router, transaction
 
 from pytils.translit import slugify
 
+from .slugs import SlugAllocator
+
+# Сколько раз подбирать slug заново, если параллельная запись
+# успела занять выбранный вариант.
+SLUG_ATTEMPTS = 3
+
 
 class Note(models.Model):
     title = models.CharField(
@@ -27,12 +33,44 @@ class Note(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    updated = models.DateTimeField('Изменена', auto_now=True)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_id_idx'),
+        )
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def base_slug(cls, title):
+        """Основа slug из заголовка, к которой добавляется номер."""
+        max_slug_length = cls._meta.get_field('slug').max_length
+        return slugify(title)[:max_slug_length] or 'note'
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        """
+        Пустой slug заполняется свободным вариантом из заголовка.
+        Подбор и запись идут в одной транзакции; если вариант всё же
+        успели занять параллельно, срабатывает ограничение уникальности,
+        и slug подбирается заново.
+        """
+        if self.slug:
+            return super().save(*args, **kwargs)
+        using = kwargs.get('using') or router.db_for_write(
+            type(self), instance=self
+        )
+        base = self.base_slug(self.title)
+        others = type(self)._default_manager.using(using).exclude(pk=self.pk)
+        max_slug_length = self._meta.get_field('slug').max_length
+        for attempt in range(1, SLUG_ATTEMPTS + 1):
+            try:
+                with transaction.atomic(using=using):
+                    allocator = SlugAllocator(others, max_slug_length)
+                    self.slug = allocator.allocate(base)
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == SLUG_ATTEMPTS:
+                    self.slug = ''
+                    raise
@@ -0,0 +1,61 @@
+"""
+Полнотекстовый поиск по заметкам.
+
+На SQLite используется виртуальная таблица FTS5 notes_note_fts
+с внешним содержимым: она хранит только индекс по title и text,
+а триггеры поддерживают его при вставке, изменении и удалении заметок.
+На других СУБД поиск откатывается к icontains.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'notes_note_fts'
+
+SEARCH_SQL = f"""
+    SELECT rowid FROM {FTS_TABLE}
+    WHERE {FTS_TABLE} MATCH %s
+    ORDER BY rank
+    LIMIT %s
+"""
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text)
+
+
+def fts_query(author_id, terms):
+    """
+    Запрос FTS5 из слов пользователя.
+
+    Каждое слово берётся в кавычки, чтобы операторы FTS5 в тексте
+    не ломали запрос, и ищется по префиксу в заголовке и тексте.
+    Условие на автора проверяется самим индексом, поэтому bm25
+    считается только для заметок этого автора.
+    """
+    words = ' '.join(
+        '"{}"*'.format(term.replace('"', '""')) for term in terms
+    )
+    return f'author_id:"{int(author_id)}" AND {{title text}}:({words})'
+
+
+def search_note_ids(queryset, author_id, text, limit):
+    """
+    Идентификаторы заметок автора, подходящих под запрос, по релевантности.
+
+    Результаты FTS5 упорядочены по bm25; без FTS5 — от новых к старым.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(SEARCH_SQL, (fts_query(author_id, terms), limit))
+            return [note_id for note_id, in cursor.fetchall()]
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(text__icontains=term)
+    return list(queryset.filter(condition).order_by(
+        '-id'
+    ).values_list('id', flat=True)[:limit])
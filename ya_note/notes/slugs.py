@@ -0,0 +1,132 @@
+"""
+Подбор свободного slug для заметок.
+
+Варианты основы — «основа», «основа-2», «основа-3»… Если основа занята,
+новая заметка получает номер на единицу больше наибольшего занятого.
+Этот номер и занятость самой основы читаются одним агрегирующим
+запросом по диапазону уникального индекса slug, так что база
+возвращает одну строку, сколько бы вариантов ни было занято.
+Для пачки заметок занятость самих основ проверяется одним запросом,
+а запрос номера нужен только основам, которые уже заняты.
+"""
+from django.db.models import Count, IntegerField, Max, Q
+from django.db.models.functions import Cast, Substr
+
+# Место под самый длинный ожидаемый суффикс, например «-1000000».
+SUFFIX_RESERVE = 8
+
+
+def with_suffix(base, number, max_length):
+    """Вариант slug с номером: base, base-2, base-3…"""
+    if number == 1:
+        return base[:max_length]
+    suffix = f'-{number}'
+    return base[:max_length - len(suffix)] + suffix
+
+
+class SlugAllocator:
+    """
+    Выдаёт свободные slug для набора заметок.
+
+    Наибольший занятый номер каждой основы читается из queryset один
+    раз, поэтому тысячи заметок с одинаковым заголовком стоят одного
+    запроса. Выданные slug запоминаются и повторно не выдаются.
+    """
+
+    def __init__(self, queryset, max_length):
+        self.queryset = queryset
+        self.max_length = max_length
+        self._taken = set()
+        self._loaded_prefixes = set()
+        self._checked = set()
+        self._next_number = {}
+
+    def preload(self, slugs):
+        """Одним запросом проверяет, какие из slug уже заняты."""
+        slugs = set(slugs) - self._checked - self._taken
+        if slugs:
+            self._taken.update(self.queryset.filter(
+                slug__in=slugs
+            ).values_list('slug', flat=True))
+        self._checked.update(slugs)
+
+    def _load_last_number(self, base):
+        """
+        Занята ли основа и наибольший занятый номер base-N.
+
+        Slug из допустимых символов, который начинается с base и меньше
+        base + '.', — это сама основа или base-что-угодно: «-» идёт
+        в таблице символов перед «.». Номер — число после «base-»; CAST
+        в SQLite читает ведущие цифры, так что варианты вроде base-2-x
+        лишь пропускают номер, но не приводят к повтору.
+        """
+        row = self.queryset.filter(
+            slug__gte=base, slug__lt=f'{base}.'
+        ).aggregate(
+            base_taken=Count('pk', filter=Q(slug=base)),
+            last_number=Max(Cast(
+                Substr('slug', len(base) + 2), output_field=IntegerField()
+            )),
+        )
+        self._checked.add(base)
+        if row['base_taken']:
+            self._taken.add(base)
+        self._next_number[base] = max(row['last_number'] or 0, 1) + 1
+
+    def _load(self, base):
+        prefix = base[:max(self.max_length - SUFFIX_RESERVE, 1)]
+        if prefix in self._loaded_prefixes:
+            return
+        self._taken.update(self.queryset.filter(
+            slug__startswith=prefix
+        ).values_list('slug', flat=True))
+        self._loaded_prefixes.add(prefix)
+
+    def is_taken(self, slug):
+        return slug in self._taken
+
+    def reserve(self, slug):
+        """Отмечает slug, заданный вручную, как занятый."""
+        self._taken.add(slug)
+
+    def allocate(self, base):
+        """Свободный вариант slug для основы base."""
+        if len(base) > self.max_length - SUFFIX_RESERVE:
+            return self._allocate_truncated(base)
+        if base not in self._checked and base not in self._taken:
+            self._load_last_number(base)
+        if base not in self._taken:
+            self._taken.add(base)
+            return base
+        if base not in self._next_number:
+            self._load_last_number(base)
+        number = self._next_number[base]
+        slug = with_suffix(base, number, self.max_length)
+        while slug in self._taken:
+            number += 1
+            slug = with_suffix(base, number, self.max_length)
+        self._taken.add(slug)
+        self._next_number[base] = number + 1
+        return slug
+
+    def _allocate_truncated(self, base):
+        """
+        Первый свободный вариант для длинной основы.
+
+        Номер у такой основы заменяет её конец, и варианты не лежат
+        в одном диапазоне индекса, поэтому занятые варианты читаются
+        целиком по общему префиксу.
+        """
+        number = self._next_number.get(base, 1)
+        if number == 1 and base in self._checked and base not in self._taken:
+            self._taken.add(base)
+            self._next_number[base] = 2
+            return base
+        self._load(base)
+        slug = with_suffix(base, number, self.max_length)
+        while slug in self._taken:
+            number += 1
+            slug = with_suffix(base, number, self.max_length)
+        self._taken.add(slug)
+        self._next_number[base] = number + 1
+        return slug
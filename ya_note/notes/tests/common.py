@@ -1,5 +1,14 @@
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, connections
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from notes.models import Note
@@ -7,7 +16,79 @@ from notes.models import Note
 User = get_user_model()
 
 
-class CommonTestSetupMixin(TestCase):
+class QueryBudgetMixin:
+    """Миксин для проверки бюджета SQL-запросов маршрутов."""
+
+    # Максимальное число SQL-запросов на GET-запрос к каждому маршруту
+    # для авторизованного пользователя. Бюджет не должен зависеть
+    # от количества записей в базе.
+    QUERY_BUDGETS = {
+        'notes:home': 2,
+        'notes:add': 2,
+        'notes:edit': 3,
+        'notes:detail': 4,
+        'notes:delete': 3,
+        'notes:list': 3,
+        'notes:search': 4,
+        'notes:import': 2,
+        'notes:export': 3,
+        'notes:success': 2,
+        'notes:list_async': 3,
+        'notes:detail_async': 3,
+        'users:login': 2,
+        'users:logout': 4,
+        'users:signup': 2,
+    }
+
+    @contextmanager
+    def assert_query_budget(self, url_name):
+        """Запросы внутри блока укладываются в бюджет маршрута."""
+        budget = self.QUERY_BUDGETS[url_name]
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        queries = '\n'.join(query['sql'] for query in context)
+        self.assertLessEqual(
+            len(context), budget,
+            f'{url_name}: {len(context)} запросов при бюджете {budget}:'
+            f'\n{queries}'
+        )
+
+
+@contextmanager
+def file_database(alias, path):
+    """
+    Отдельная база SQLite в файле под псевдонимом alias.
+
+    База не связана с тестовой и видна всем потокам.
+    """
+    connections.settings[alias] = {
+        **settings.DB_PROFILES['tuned'],
+        'NAME': str(path),
+    }
+    connections.ensure_defaults(alias)
+    connections.prepare_test_settings(alias)
+    try:
+        call_command('migrate', database=alias, verbosity=0)
+        yield alias
+    finally:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+
+
+class FileDatabaseMixin:
+    """Миксин для тестов, которым нужна отдельная файловая база."""
+
+    def add_file_database(self, alias):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        database = file_database(alias, Path(directory) / f'{alias}.sqlite3')
+        database.__enter__()
+        self.addCleanup(database.__exit__, None, None, None)
+        return alias
+
+
+class CommonTestSetupMixin(QueryBudgetMixin, TestCase):
     """Миксин для общих настроек тестов."""
 
     @classmethod
@@ -32,6 +113,9 @@ class CommonTestSetupMixin(TestCase):
 
     SLUG = {'slug': 'some-slug'}
     LIST_VIEW_URL = reverse('notes:list')
+    SEARCH_URL = reverse('notes:search')
+    IMPORT_URL = reverse('notes:import')
+    EXPORT_URL = reverse('notes:export')
     ADD_NOTE_URL = reverse('notes:add')
     EDIT_NOTE_URL = reverse('notes:edit', kwargs=SLUG)
     DELETE_NOTE_URL = reverse('notes:delete', kwargs=SLUG)
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from .common import CommonTestSetupMixin
+
+
+class NoteAsyncViewTests(CommonTestSetupMixin):
+    """Класс тестов асинхронных страниц заметок."""
+
+    LIST_ASYNC_URL = reverse('notes:list_async')
+
+    def asgi_get(self, url, user=None):
+        """GET-запрос через ASGI-обработчик, как под uvicorn."""
+        client = AsyncClient()
+        if user is not None:
+            client.force_login(user)
+
+        async def send():
+            return await client.get(url)
+
+        return async_to_sync(send)()
+
+    def detail_async_url(self, note):
+        return reverse('notes:detail_async', kwargs={'slug': note.slug})
+
+    def test_async_list_matches_sync(self):
+        """Асинхронный список выводит те же заметки, что и синхронный."""
+        expected = self.author_client.get(self.LIST_VIEW_URL)
+        response = self.asgi_get(self.LIST_ASYNC_URL, self.author)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            list(response.context['object_list']),
+            list(expected.context['object_list'])
+        )
+
+    def test_async_list_bad_after(self):
+        """Асинхронный список разбирает after так же, как синхронный."""
+        response = self.asgi_get(f'{self.LIST_ASYNC_URL}?after=²', self.author)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_async_detail(self):
+        """Автор видит свою заметку, другой пользователь получает 404."""
+        url = self.detail_async_url(self.note1)
+        response = self.asgi_get(url, self.author)
+        self.assertEqual(response.context['note'], self.note1)
+        response = self.asgi_get(url, self.reader)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_async_views_require_login(self):
+        """Анонимного пользователя отправляют на страницу входа."""
+        for url in (self.LIST_ASYNC_URL, self.detail_async_url(self.note1)):
+            with self.subTest(url=url):
+                response = self.asgi_get(url)
+                self.assertRedirects(
+                    response, f'{self.LOGIN_URL}?next={url}',
+                    fetch_redirect_response=False
+                )
+
+    def test_async_server_timing_counts_queries(self):
+        """Под ASGI запросы к базе из потока попадают в замеры."""
+        response = self.asgi_get(self.LIST_ASYNC_URL, self.author)
+        self.assertIn('desc="3 queries"', response['Server-Timing'])
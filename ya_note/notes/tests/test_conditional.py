@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+
+from .common import CommonTestSetupMixin
+
+
+class NoteConditionalGetTests(CommonTestSetupMixin):
+    """Класс тестов условных запросов к странице заметки."""
+
+    def setUp(self):
+        self.url = reverse('notes:detail', kwargs={'slug': self.note1.slug})
+
+    def test_detail_page_has_validators(self):
+        """Страница заметки отдаёт ETag и Last-Modified."""
+        response = self.author_client.get(self.url)
+        self.note1.refresh_from_db()
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertEqual(
+            response['Last-Modified'],
+            http_date(int(self.note1.updated.timestamp()))
+        )
+
+    def test_not_modified_without_rendering(self):
+        """
+        Актуальная страница получает 304 без отрисовки шаблона.
+
+        Кроме запроса валидаторов читаются только сессия и пользователь.
+        """
+        etag = self.author_client.get(self.url)['ETag']
+        with CaptureQueriesContext(connection) as context:
+            response = self.author_client.get(
+                self.url, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(len(context), 3)
+        self.assertFalse(response.templates)
+
+    def test_if_modified_since(self):
+        """Запрос с If-Modified-Since без изменений получает 304."""
+        last_modified = self.author_client.get(self.url)['Last-Modified']
+        response = self.author_client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_edit_updates_etag(self):
+        """Правка заметки меняет ETag."""
+        etag = self.author_client.get(self.url)['ETag']
+        self.note1.text = 'Новый текст'
+        self.note1.save()
+        response = self.author_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_other_user_gets_not_found(self):
+        """Чужой ETag не открывает доступ к заметке."""
+        etag = self.author_client.get(self.url)['ETag']
+        response = self.reader_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
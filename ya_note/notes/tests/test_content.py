@@ -1,3 +1,6 @@
+from http import HTTPStatus
+
+from django.test import override_settings
 from django.urls import reverse
 
 from .common import CommonTestSetupMixin
@@ -37,3 +40,41 @@ class NoteContentTests(CommonTestSetupMixin):
             reverse('notes:edit', kwargs={'slug': note.slug})
         )
         self.assertIsNotNone(response.context['form'])
+
+    @override_settings(NOTES_PER_PAGE=1)
+    def test_list_view_keyset_pagination(self):
+        """Список заметок выводится страницами по возрастанию id."""
+        seen = []
+        url = self.LIST_VIEW_URL
+        while url:
+            response = self.author_client.get(url)
+            page = response.context['object_list']
+            self.assertLessEqual(len(page), 1)
+            seen.extend(page)
+            after = response.context['next_after']
+            url = after and f'{self.LIST_VIEW_URL}?after={after}'
+        self.assertEqual(seen, [self.note1, self.note2])
+
+    def test_list_view_bad_after(self):
+        """Некорректный параметр after даёт 404, а не ошибку сервера."""
+        for after in ('abc', '²', '9' * 30, f'-{2**63 + 1}'):
+            with self.subTest(after=after):
+                response = self.author_client.get(
+                    self.LIST_VIEW_URL, {'after': after}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_list_view_defers_text(self):
+        """Список заметок не загружает текст заметок."""
+        response = self.author_client.get(self.LIST_VIEW_URL)
+        note = response.context['object_list'][0]
+        self.assertEqual(
+            note.get_deferred_fields(), {'text', 'author_id', 'updated'}
+        )
+
+    def test_list_view_uses_author_id_index(self):
+        """Список заметок читается по индексу (author, id)."""
+        plan = Note.objects.filter(
+            author=self.author, id__gt=0
+        ).order_by('id').explain()
+        self.assertIn('note_author_id_idx', plan)
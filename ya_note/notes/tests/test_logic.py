@@ -1,10 +1,14 @@
 from http import HTTPStatus
+from unittest import mock
 
+from django.db import connection
 from django.http import HttpResponseRedirect
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytils.translit import slugify
 
 from notes.models import Note
+from notes.slugs import SlugAllocator
 from .common import CommonTestSetupMixin
 from notes.forms import WARNING
 
@@ -121,3 +125,62 @@ class NoteLogicTests(CommonTestSetupMixin):
         self.assertEqual(self.note1.title, original_title)
         self.assertEqual(self.note1.text, original_text)
         self.assertTrue(Note.objects.filter(id=self.note1.id).exists())
+
+    def test_duplicate_titles_get_numbered_slugs(self):
+        """Заметки с одинаковым заголовком получают slug с номером."""
+        notes = [
+            Note.objects.create(text='Текст', author=self.author)
+            for _ in range(3)
+        ]
+        base = slugify(Note._meta.get_field('title').default)
+        self.assertEqual(
+            [note.slug for note in notes],
+            [base, f'{base}-2', f'{base}-3']
+        )
+
+    def test_slug_number_follows_largest_taken(self):
+        """Номер следует за наибольшим занятым номером основы."""
+        base = slugify('Заголовок')
+        for slug in (base, f'{base}-2', f'{base}-10', f'{base}-x'):
+            Note.objects.create(
+                title='Заголовок', text='Текст', slug=slug, author=self.author
+            )
+        note = Note.objects.create(
+            title='Заголовок', text='Текст', author=self.author
+        )
+        self.assertEqual(note.slug, f'{base}-11')
+
+    def test_form_without_slug_resolves_duplicate_title(self):
+        """Форма без slug не падает на повторяющемся заголовке."""
+        response = self.author_client.post(self.ADD_NOTE_URL, {
+            'title': self.note1.title,
+            'text': 'Текст',
+        })
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        self.assertEqual(
+            Note.objects.latest('pk').slug, f'{self.note1.slug}-2'
+        )
+
+    def test_slug_allocation_query_count_is_constant(self):
+        """Подбор slug стоит одинаково при любом числе совпадений."""
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                Note.objects.create(text='Текст', author=self.author)
+            return len(context)
+
+        first = count_queries()
+        for _ in range(100):
+            Note.objects.create(text='Текст', author=self.author)
+        self.assertEqual(count_queries(), first)
+
+    def test_slug_allocation_retries_on_concurrent_insert(self):
+        """Если slug заняли параллельно, подбирается следующий."""
+        taken_slug = self.note1.slug
+        with mock.patch.object(
+                SlugAllocator, 'allocate',
+                side_effect=[taken_slug, 'free-slug']
+        ):
+            note = Note.objects.create(
+                title=self.note1.title, text='Текст', author=self.author
+            )
+        self.assertEqual(note.slug, 'free-slug')
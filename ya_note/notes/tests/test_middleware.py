@@ -0,0 +1,29 @@
+from django.test import Client, override_settings
+
+from yanote.middleware import registry
+from .common import CommonTestSetupMixin
+
+
+class PerformanceMiddlewareTests(CommonTestSetupMixin):
+    """Класс тестов замера производительности."""
+
+    def setUp(self):
+        registry.clear()
+
+    def test_server_timing_header(self):
+        """Ответ содержит время запроса, SQL и отрисовки шаблона."""
+        response = self.author_client.get(self.LIST_VIEW_URL)
+        metrics = [
+            metric.split(';')[0]
+            for metric in response['Server-Timing'].split(', ')
+        ]
+        self.assertEqual(metrics, ['db', 'render', 'total'])
+        self.assertEqual(
+            registry.get('notes:list', 'request_seconds').count, 1
+        )
+
+    @override_settings(PERF_TIMING_ENABLED=False)
+    def test_timing_can_be_disabled(self):
+        """При выключенной настройке middleware не подключается."""
+        response = Client().get(self.HOME_URL)
+        self.assertFalse(response.has_header('Server-Timing'))
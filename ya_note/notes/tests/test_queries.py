@@ -0,0 +1,67 @@
+from django.test import Client
+from django.urls import URLResolver, get_resolver, reverse
+
+from notes.models import Note
+from .common import CommonTestSetupMixin
+
+ROW_COUNTS = (1, 100, 10_000)
+SKIPPED_NAMESPACES = ('admin',)
+
+
+def route_names(patterns, namespace=None):
+    """Имена всех маршрутов проекта с учётом пространств имён."""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            inner = pattern.namespace or namespace
+            if inner not in SKIPPED_NAMESPACES:
+                yield from route_names(pattern.url_patterns, inner)
+        elif pattern.name:
+            yield f'{namespace}:{pattern.name}' if namespace else pattern.name
+
+
+class NoteQueryBudgetTests(CommonTestSetupMixin):
+    """Класс тестов бюджета SQL-запросов."""
+
+    def test_every_route_has_query_budget(self):
+        """Для каждого маршрута объявлен бюджет запросов."""
+        routes = set(route_names(get_resolver().url_patterns))
+        self.assertEqual(routes, set(self.QUERY_BUDGETS))
+
+    def test_routes_fit_query_budget(self):
+        """
+        Число запросов маршрутов не превышает бюджет при любом объёме.
+
+        Потоковый ответ читается внутри замера: его строки выбираются
+        из базы только при чтении тела.
+        """
+        slug = {'slug': self.note1.slug}
+        route_kwargs = {
+            'notes:edit': slug,
+            'notes:detail': slug,
+            'notes:detail_async': slug,
+            'notes:delete': slug,
+        }
+        # GET-параметры, без которых страница не делает работу.
+        route_query = {
+            'notes:search': {'q': 'Заметка'},
+        }
+        for row_count in ROW_COUNTS:
+            existing = Note.objects.filter(author=self.author).count()
+            Note.objects.bulk_create(
+                Note(
+                    title=f'Заметка {i}',
+                    text='Текст',
+                    slug=f'note-{i}',
+                    author=self.author,
+                )
+                for i in range(existing, row_count)
+            )
+            for url_name in self.QUERY_BUDGETS:
+                url = reverse(url_name, kwargs=route_kwargs.get(url_name))
+                client = Client()
+                client.force_login(self.author)
+                with self.subTest(rows=row_count, url_name=url_name):
+                    with self.assert_query_budget(url_name):
+                        response = client.get(url, route_query.get(url_name))
+                        if response.streaming:
+                            b''.join(response.streaming_content)
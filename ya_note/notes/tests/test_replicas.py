@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.test import override_settings
+from django.urls import reverse
+
+from notes.models import Note
+from yanote.replicas import PIN_COOKIE
+from .common import CommonTestSetupMixin, FileDatabaseMixin
+
+REPLICA = 'replica'
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class NoteReplicaTests(FileDatabaseMixin, CommonTestSetupMixin):
+    """Класс тестов чтения с реплики."""
+
+    def setUp(self):
+        self.add_file_database(REPLICA)
+        self.client.force_login(self.author)
+        # Реплика — копия основной базы, но с устаревшей заметкой.
+        for model in (get_user_model(), Session, Note):
+            model.objects.using(REPLICA).bulk_create(model.objects.all())
+        Note.objects.using(REPLICA).filter(pk=self.note1.pk).update(
+            title='Устаревший заголовок'
+        )
+        self.detail_url = reverse(
+            'notes:detail', kwargs={'slug': self.note1.slug}
+        )
+
+    def test_listed_views_read_from_replica(self):
+        """Список и страница заметки читаются с реплики."""
+        for url in (self.LIST_VIEW_URL, self.detail_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Устаревший заголовок')
+
+    def test_other_views_read_from_primary(self):
+        """Остальные страницы читают из основной базы."""
+        url = reverse('notes:edit', kwargs={'slug': self.note1.slug})
+        response = self.client.get(url)
+        self.assertEqual(response.context['note'].title, self.note1.title)
+
+    def test_read_after_write_uses_primary(self):
+        """После записи клиент читает свою правку из основной базы."""
+        url = reverse('notes:edit', kwargs={'slug': self.note1.slug})
+        response = self.client.post(url, {
+            'title': 'Новый заголовок',
+            'text': self.note1.text,
+            'slug': self.note1.slug,
+        })
+        self.assertIn(PIN_COOKIE, response.cookies)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.context['note'].title, 'Новый заголовок')
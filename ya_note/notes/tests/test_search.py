@@ -0,0 +1,79 @@
+from django.db import connection
+
+from notes.models import Note
+from .common import CommonTestSetupMixin
+
+
+class NoteSearchTests(CommonTestSetupMixin):
+    """Класс тестов поиска по заметкам."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.recipe = Note.objects.create(
+            title='Рецепт пирога',
+            text='Мука, яблоки, корица. Пирог печь сорок минут.',
+            author=cls.author,
+        )
+        cls.shopping = Note.objects.create(
+            title='Покупки',
+            text='Купить яблоки и молоко.',
+            author=cls.author,
+        )
+        cls.foreign = Note.objects.create(
+            title='Чужой пирог',
+            text='Пирог читателя.',
+            author=cls.reader,
+        )
+
+    def search(self, query, client=None):
+        response = (client or self.author_client).get(
+            self.SEARCH_URL, {'q': query}
+        )
+        return list(response.context['object_list'])
+
+    def test_search_finds_notes_by_title_and_text(self):
+        """Поиск находит заметки по заголовку и тексту."""
+        self.assertEqual(self.search('молоко'), [self.shopping])
+        self.assertCountEqual(
+            self.search('яблоки'), [self.recipe, self.shopping]
+        )
+
+    def test_search_is_scoped_to_author(self):
+        """Поиск не находит заметки других пользователей."""
+        self.assertEqual(self.search('пирог'), [self.recipe])
+        self.assertEqual(
+            self.search('пирог', self.reader_client), [self.foreign]
+        )
+
+    def test_search_ranks_by_relevance(self):
+        """Заметки с большим числом совпадений идут первыми."""
+        Note.objects.create(
+            title='Яблоки', text='Яблоки, яблоки и снова яблоки.',
+            author=self.author,
+        )
+        self.assertEqual(self.search('яблоки')[0].title, 'Яблоки')
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """Индекс обновляется при изменении и удалении заметок."""
+        self.shopping.text = 'Купить кефир.'
+        self.shopping.save()
+        self.assertEqual(self.search('молоко'), [])
+        self.assertEqual(self.search('кефир'), [self.shopping])
+        self.shopping.delete()
+        self.assertEqual(self.search('кефир'), [])
+
+    def test_search_query_with_fts_syntax(self):
+        """Операторы FTS5 в запросе не приводят к ошибке."""
+        self.assertEqual(self.search('пирог" ^(*'), [self.recipe])
+
+    def test_search_uses_fts_index(self):
+        """На SQLite поиск идёт по индексу FTS5."""
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 есть только в SQLite.')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT count(*) FROM notes_note_fts '
+                'WHERE notes_note_fts MATCH %s', ('"пирог"*',)
+            )
+            self.assertEqual(cursor.fetchone()[0], 2)
@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connections
+from django.test import SimpleTestCase
+
+from notes.models import Note
+from .common import FileDatabaseMixin
+
+ALIAS = 'stress'
+THREADS = 8
+NOTES_PER_THREAD = 10
+
+
+class SQLiteProfileTests(FileDatabaseMixin, SimpleTestCase):
+    """
+    Класс тестов профиля tuned на файловой базе.
+
+    База общая для всех потоков и не связана с тестовой базой,
+    поэтому тесты наследуются от SimpleTestCase.
+    """
+
+    def setUp(self):
+        self.add_file_database(ALIAS)
+        self.author = get_user_model().objects.db_manager(ALIAS).create(
+            username='Автор'
+        )
+
+    def test_tuned_profile_pragmas(self):
+        """Подключение настраивается PRAGMA из профиля."""
+        expected = {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'cache_size': -64 * 1024,
+        }
+        with connections[ALIAS].cursor() as cursor:
+            for pragma, value in expected.items():
+                with self.subTest(pragma=pragma):
+                    cursor.execute(f'PRAGMA {pragma}')
+                    self.assertEqual(cursor.fetchone()[0], value)
+
+    def create_notes(self, barrier):
+        """Создаёт заметки с одинаковым заголовком из отдельного потока."""
+        errors = 0
+        barrier.wait()
+        try:
+            for _ in range(NOTES_PER_THREAD):
+                try:
+                    Note.objects.db_manager(ALIAS).create(
+                        title='Общий заголовок', text='Текст',
+                        author_id=self.author.pk,
+                    )
+                except OperationalError:
+                    errors += 1
+        finally:
+            connections[ALIAS].close()
+        return errors
+
+    def test_parallel_notes_do_not_fail(self):
+        """Параллельное создание заметок проходит без ошибок."""
+        barrier = threading.Barrier(THREADS)
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            errors = list(pool.map(
+                lambda _: self.create_notes(barrier), range(THREADS)
+            ))
+        self.assertEqual(sum(errors), 0)
+        slugs = Note.objects.using(ALIAS).values_list('slug', flat=True)
+        self.assertEqual(len(set(slugs)), THREADS * NOTES_PER_THREAD)
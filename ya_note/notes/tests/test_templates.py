@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+import yanote.settings
+from yanote.settings import prod
+from yanote.warmup import warm_up_templates
+
+
+@override_settings(TEMPLATES=prod.TEMPLATES)
+class TemplateWarmUpTests(SimpleTestCase):
+    """Класс тестов прогрева шаблонов."""
+
+    def test_warm_up_fills_template_cache(self):
+        """Прогрев компилирует все шаблоны из templates/ в кеш загрузчика."""
+        directory = settings.BASE_DIR / 'templates'
+        names = {
+            path.relative_to(directory).as_posix()
+            for path in directory.rglob('*.html')
+        }
+        self.assertEqual(warm_up_templates(), len(names))
+        loader, = engines['django'].engine.template_loaders
+        self.assertTrue(set(loader.get_template_cache) >= names)
+
+
+class DefaultSettingsTests(SimpleTestCase):
+    """Класс тестов профиля по умолчанию."""
+
+    def test_package_default_is_not_debug(self):
+        """Пакет настроек, открытый всем хостам, не включает DEBUG."""
+        self.assertEqual(yanote.settings.ALLOWED_HOSTS, ['*'])
+        self.assertFalse(yanote.settings.DEBUG)
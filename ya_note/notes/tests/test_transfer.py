@@ -0,0 +1,176 @@
+import csv
+import io
+import json
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from notes.forms import WARNING
+from notes.models import Note
+from notes.transfer import NOT_UTF8, import_notes, read_rows
+from .common import CommonTestSetupMixin
+
+
+def ndjson_file(rows, name='notes.ndjson'):
+    content = '\n'.join(
+        row if isinstance(row, str) else json.dumps(row, ensure_ascii=False)
+        for row in rows
+    )
+    return SimpleUploadedFile(name, content.encode('utf-8'))
+
+
+class NoteTransferTests(CommonTestSetupMixin):
+    """Класс тестов импорта и экспорта заметок."""
+
+    def import_file(self, uploaded_file):
+        response = self.author_client.post(
+            self.IMPORT_URL, {'file': uploaded_file}
+        )
+        return response.context['result']
+
+    def export(self, export_format, client=None):
+        response = (client or self.author_client).get(
+            self.EXPORT_URL, {'format': export_format}
+        )
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_import_ndjson(self):
+        """Заметки из NDJSON создаются от имени пользователя."""
+        result = self.import_file(ndjson_file([
+            {'title': 'Первая', 'text': 'Текст первой'},
+            {'title': 'Вторая', 'text': 'Текст второй', 'slug': 'vtoraya'},
+        ]))
+        self.assertEqual((result.created, result.error_count), (2, 0))
+        self.assertEqual(
+            Note.objects.get(slug='vtoraya').author, self.author
+        )
+        self.assertTrue(Note.objects.filter(
+            title='Первая', author=self.author
+        ).exists())
+
+    def test_import_csv(self):
+        """Заметки импортируются из CSV с заголовком."""
+        content = io.StringIO()
+        writer = csv.writer(content)
+        writer.writerow(('title', 'text', 'slug'))
+        writer.writerow(('Из CSV', 'Текст, с запятой', ''))
+        result = self.import_file(SimpleUploadedFile(
+            'notes.csv', content.getvalue().encode('utf-8')
+        ))
+        self.assertEqual(result.created, 1)
+        self.assertEqual(
+            Note.objects.get(title='Из CSV').text, 'Текст, с запятой'
+        )
+
+    def test_import_numbers_duplicate_titles(self):
+        """Одинаковые заголовки получают slug с номерами."""
+        self.import_file(ndjson_file(
+            [{'title': 'Дубль', 'text': 'Текст'}] * 3
+        ))
+        self.assertCountEqual(
+            Note.objects.filter(title='Дубль').values_list('slug', flat=True),
+            ['dubl', 'dubl-2', 'dubl-3']
+        )
+
+    def test_import_reports_invalid_rows(self):
+        """Ошибочные строки пропускаются и попадают в отчёт."""
+        result = self.import_file(ndjson_file([
+            {'title': 'Хорошая', 'text': 'Текст'},
+            'не json',
+            {'title': 'Без текста'},
+            {'title': 'Чужой slug', 'text': 'Текст', 'slug': self.note1.slug},
+        ]))
+        self.assertEqual((result.created, result.error_count), (1, 3))
+        self.assertEqual(
+            [line for line, _ in result.errors], [2, 3, 4]
+        )
+        self.assertIn(self.note1.slug + WARNING, result.errors[2][1])
+
+    def test_import_csv_keeps_line_breaks_in_quoted_fields(self):
+        """Перевод строки внутри поля CSV остаётся частью текста."""
+        content = io.StringIO()
+        writer = csv.writer(content)
+        writer.writerow(('title', 'text'))
+        writer.writerow(('Многострочная', 'Первая строка\r\nвторая строка'))
+        writer.writerow(('Следующая', 'Текст'))
+        result = self.import_file(SimpleUploadedFile(
+            'notes.csv', content.getvalue().encode('utf-8')
+        ))
+        self.assertEqual((result.created, result.error_count), (2, 0))
+        self.assertEqual(
+            Note.objects.get(title='Многострочная').text,
+            'Первая строка\r\nвторая строка'
+        )
+
+    def test_import_reports_lines_not_in_utf8(self):
+        """Строки не в UTF-8 попадают в отчёт, остальные импортируются."""
+        content = (
+            'title,text\r\n'.encode()
+            + 'Из Excel,Текст в cp1251\r\n'.encode('cp1251')
+            + 'Из UTF-8,Текст\r\n'.encode()
+        )
+        result = self.import_file(SimpleUploadedFile('notes.csv', content))
+        self.assertEqual((result.created, result.error_count), (1, 1))
+        self.assertEqual(result.errors, [(2, NOT_UTF8)])
+        result = self.import_file(SimpleUploadedFile(
+            'notes.ndjson',
+            json.dumps({'title': 'Плохая', 'text': 'Текст'},
+                       ensure_ascii=False).encode('cp1251')
+            + b'\n' + json.dumps({'title': 'Хорошая', 'text': 'Т'}).encode()
+        ))
+        self.assertEqual((result.created, result.error_count), (1, 1))
+        self.assertEqual(result.errors, [(1, NOT_UTF8)])
+
+    def test_import_reports_csv_header_not_in_utf8(self):
+        """Заголовок не в UTF-8 — ошибка файла, а не каждой строки."""
+        content = 'Заголовок,Текст\r\nЗаметка,Текст\r\n'.encode('cp1251')
+        result = self.import_file(SimpleUploadedFile('notes.csv', content))
+        self.assertEqual((result.created, result.errors), (0, [(1, NOT_UTF8)]))
+
+    def test_import_reports_csv_errors(self):
+        """Ошибка разбора CSV относится к одной записи."""
+        content = io.StringIO()
+        writer = csv.writer(content)
+        writer.writerow(('title', 'text'))
+        writer.writerow(('Огромная', 'x' * (csv.field_size_limit() + 1)))
+        writer.writerow(('Обычная', 'Текст'))
+        result = self.import_file(SimpleUploadedFile(
+            'notes.csv', content.getvalue().encode('utf-8')
+        ))
+        self.assertEqual((result.created, result.error_count), (1, 1))
+        self.assertEqual(result.errors[0][0], 2)
+        self.assertIn('CSV', result.errors[0][1])
+
+    def test_import_queries_do_not_grow_with_rows(self):
+        """Число запросов зависит от числа пачек, а не строк."""
+        def count_queries(total, prefix):
+            rows = read_rows(ndjson_file([
+                {'title': f'{prefix} {number}', 'text': 'Текст'}
+                for number in range(total)
+            ]))
+            with CaptureQueriesContext(connection) as context:
+                import_notes(rows, self.author, batch_size=total)
+            return len(context)
+
+        self.assertEqual(count_queries(10, 'Малая'),
+                         count_queries(150, 'Большая'))
+
+    def test_export_round_trip(self):
+        """Экспорт содержит только заметки автора и импортируется обратно."""
+        Note.objects.create(title='Чужая', text='Текст', author=self.reader)
+        exported = self.export('ndjson')
+        rows = [json.loads(line) for line in exported.splitlines()]
+        self.assertEqual(
+            [row['slug'] for row in rows], [self.note1.slug, self.note2.slug]
+        )
+        Note.objects.filter(author=self.author).delete()
+        result = self.import_file(ndjson_file(rows))
+        self.assertEqual(result.created, 2)
+        self.assertEqual(self.export('ndjson'), exported)
+
+    def test_export_csv(self):
+        """Экспорт в CSV начинается с заголовка."""
+        rows = list(csv.reader(io.StringIO(self.export('csv'))))
+        self.assertEqual(rows[0], ['title', 'text', 'slug'])
+        self.assertEqual(rows[1], ['Заголовок1', 'Текст1', self.note1.slug])
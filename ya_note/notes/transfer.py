@@ -0,0 +1,202 @@
+"""
+Массовый импорт и экспорт заметок.
+
+Импорт читает загруженный файл построчно (NDJSON или CSV), проверяет
+каждую строку правилами NoteForm, подбирает slug пачкой и записывает
+заметки через bulk_create в одной транзакции. Экспорт отдаёт заметки
+потоком, читая их из базы порциями, так что ни импорт, ни экспорт
+не держат в памяти весь набор заметок.
+"""
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.db import transaction
+
+from .forms import WARNING, NoteImportRowForm
+from .models import Note
+from .slugs import SlugAllocator
+
+FIELDS = ('title', 'text', 'slug')
+MAX_REPORTED_ERRORS = 100
+NOT_JSON_OBJECT = 'Строка не является JSON-объектом.'
+NOT_UTF8 = 'Строка не в кодировке UTF-8.'
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    error_count: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def decode_lines(uploaded_file, bad_lines):
+    """
+    Строки файла как текст, переводы строк сохраняются как есть.
+
+    Каждая строка декодируется отдельно, поэтому файл не в UTF-8
+    (например, CSV из Excel в cp1251) не прерывает импорт: номер такой
+    строки попадает в bad_lines, а текст декодируется с заменой
+    неизвестных байтов.
+    """
+    for line, raw in enumerate(uploaded_file, start=1):
+        if line == 1 and raw.startswith(codecs.BOM_UTF8):
+            raw = raw[len(codecs.BOM_UTF8):]
+        try:
+            yield raw.decode('utf-8')
+        except UnicodeDecodeError:
+            bad_lines.add(line)
+            yield raw.decode('utf-8', errors='replace')
+
+
+def read_csv_rows(lines, bad_lines):
+    """
+    Записи CSV с заголовком.
+
+    Запись может занимать несколько строк файла, номер — первая из них.
+    Ошибка разбора CSV относится к одной записи, чтение продолжается.
+    """
+    reader = csv.DictReader(lines)
+    if reader.fieldnames is None:
+        return
+    if 1 in bad_lines:
+        yield 1, NOT_UTF8
+        return
+    while True:
+        start = reader.line_num + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as error:
+            yield start, f'Ошибка CSV: {error}.'
+            continue
+        if bad_lines.intersection(range(start, reader.line_num + 1)):
+            yield start, NOT_UTF8
+        else:
+            yield start, row
+
+
+def read_rows(uploaded_file):
+    """
+    Строки файла как пары (номер строки, словарь полей).
+
+    Вместо словаря для ошибочной строки возвращается описание ошибки.
+    Формат определяется по расширению: .csv — CSV с заголовком,
+    иначе NDJSON (один JSON-объект в строке).
+    """
+    bad_lines = set()
+    lines = decode_lines(uploaded_file, bad_lines)
+    if uploaded_file.name.lower().endswith('.csv'):
+        yield from read_csv_rows(lines, bad_lines)
+        return
+    for line, raw in enumerate(lines, start=1):
+        if line in bad_lines:
+            yield line, NOT_UTF8
+            continue
+        if not raw.strip():
+            continue
+        try:
+            row = json.loads(raw)
+        except ValueError:
+            row = None
+        yield line, row if isinstance(row, dict) else NOT_JSON_OBJECT
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    batch = list(islice(rows, size))
+    while batch:
+        yield batch
+        batch = list(islice(rows, size))
+
+
+def _validated_notes(batch, author, result):
+    """Заметки из строк, прошедших проверку NoteForm."""
+    for line, row in batch:
+        if isinstance(row, str):
+            result.add_error(line, row)
+            continue
+        form = NoteImportRowForm({name: row.get(name) for name in FIELDS})
+        if not form.is_valid():
+            result.add_error(line, ' '.join(
+                f'{name}: {" ".join(errors)}'
+                for name, errors in form.errors.items()
+            ))
+            continue
+        note = form.save(commit=False)
+        note.author = author
+        yield line, note
+
+
+def _assign_slugs(notes, allocator, result):
+    """
+    Проверяет заданные slug и подбирает недостающие.
+
+    Занятость заданных вручную slug и основ для пустых slug проверяется
+    одним запросом на пачку, свободные варианты выдаёт allocator.
+    """
+    bases = {
+        line: Note.base_slug(note.title) for line, note in notes
+        if not note.slug
+    }
+    allocator.preload(
+        [note.slug for _, note in notes if note.slug] + list(bases.values())
+    )
+    accepted = []
+    for line, note in notes:
+        if not note.slug:
+            continue
+        if allocator.is_taken(note.slug):
+            result.add_error(line, f'slug: {note.slug}{WARNING}')
+            continue
+        allocator.reserve(note.slug)
+        accepted.append(note)
+    for line, note in notes:
+        if not note.slug:
+            note.slug = allocator.allocate(bases[line])
+            accepted.append(note)
+    return accepted
+
+
+def import_notes(rows, author, batch_size):
+    """Импортирует строки как заметки автора, ошибки собирает в отчёт."""
+    result = ImportResult()
+    allocator = SlugAllocator(
+        Note.objects.all(), Note._meta.get_field('slug').max_length
+    )
+    with transaction.atomic():
+        for batch in _batches(rows, batch_size):
+            notes = list(_validated_notes(batch, author, result))
+            notes = _assign_slugs(notes, allocator, result)
+            Note.objects.bulk_create(notes, batch_size=batch_size)
+            result.created += len(notes)
+    return result
+
+
+class Echo:
+    """Псевдобуфер для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def export_ndjson(queryset, chunk_size):
+    rows = queryset.order_by('id').values_list(*FIELDS).iterator(chunk_size)
+    for row in rows:
+        yield json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + '\n'
+
+
+def export_csv(queryset, chunk_size):
+    writer = csv.writer(Echo())
+    yield writer.writerow(FIELDS)
+    rows = queryset.order_by('id').values_list(*FIELDS).iterator(chunk_size)
+    for row in rows:
+        yield writer.writerow(row)
@@ -11,5 +11,14 @@ urlpatterns = [
     path('note/<slug:slug>/', views.NoteDetail.as_view(), name='detail'),
     path('delete/<slug:slug>/', views.NoteDelete.as_view(), name='delete'),
     path('notes/', views.NotesList.as_view(), name='list'),
+    path('search/', views.NoteSearch.as_view(), name='search'),
+    path('import/', views.NoteImport.as_view(), name='import'),
+    path('export/', views.NoteExport.as_view(), name='export'),
     path('done/', views.NoteSuccess.as_view(), name='success'),
+    path('async/notes/', views.notes_list_async, name='list_async'),
+    path(
+        'async/note/<slug:slug>/',
+        views.note_detail_async,
+        name='detail_async'
+    ),
 ]
@@ -1,9 +1,20 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
+from django.http import (
+    Http404, HttpResponseNotAllowed, StreamingHttpResponse
+)
+from django.shortcuts import render
 from django.urls import reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from django.views import generic
 
-from .forms import NoteForm
+from .forms import NoteForm, NoteImportForm
 from .models import Note
+from .search import search_note_ids
+from .transfer import export_csv, export_ndjson, import_notes, read_rows
 
 
 class Home(generic.TemplateView):
@@ -50,10 +61,191 @@ class NoteDelete(NoteBase, generic.DeleteView):
 
 
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
+    """
+    Список всех заметок пользователя.
+
+    Заметки выводятся страницами по возрастанию id: следующая страница
+    начинается после id из GET-параметра after. Запрос идёт по индексу
+    (author, id) и не читает текст заметок, поэтому время ответа
+    не зависит от числа заметок пользователя.
+    """
     template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        queryset = super().get_queryset().only(
+            'id', 'slug', 'title'
+        ).order_by('id')
+        after = self.request.GET.get('after')
+        if after:
+            try:
+                after = int(after)
+            except ValueError:
+                raise Http404('Некорректный параметр after.')
+            # Целые числа SQLite — 64-битные, большее число не сравнить.
+            if not -2**63 <= after < 2**63:
+                raise Http404('Некорректный параметр after.')
+            queryset = queryset.filter(id__gt=after)
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        per_page = settings.NOTES_PER_PAGE
+        notes = list(self.object_list[:per_page + 1])
+        has_next = len(notes) > per_page
+        notes = notes[:per_page]
+        context = super().get_context_data(object_list=notes, **kwargs)
+        context['next_after'] = notes[-1].id if has_next else None
+        return context
+
+
+class NoteSearch(NoteBase, generic.ListView):
+    """
+    Поиск по заметкам пользователя.
+
+    Полнотекстовый индекс возвращает id в порядке релевантности,
+    сами заметки читаются через общее правило доступа NoteBase.
+    """
+    template_name = 'notes/search.html'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        note_ids = search_note_ids(
+            queryset,
+            self.request.user.id,
+            self.request.GET.get('q', ''),
+            settings.NOTES_SEARCH_LIMIT,
+        )
+        if not note_ids:
+            return []
+        notes = queryset.only('id', 'slug', 'title').in_bulk(note_ids)
+        return [notes[note_id] for note_id in note_ids if note_id in notes]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        return context
+
+
+class NoteImport(NoteBase, generic.FormView):
+    """Импорт заметок из файла NDJSON или CSV."""
+    template_name = 'notes/import.html'
+    form_class = NoteImportForm
+
+    def form_valid(self, form):
+        result = import_notes(
+            read_rows(form.cleaned_data['file']),
+            self.request.user,
+            settings.NOTES_IMPORT_BATCH_SIZE,
+        )
+        return self.render_to_response(
+            self.get_context_data(form=NoteImportForm(), result=result)
+        )
+
+
+class NoteExport(NoteBase, generic.View):
+    """
+    Экспорт всех заметок пользователя.
+
+    Ответ формируется потоком: заметки читаются из базы порциями
+    по NOTES_EXPORT_CHUNK_SIZE и сразу отправляются клиенту.
+    """
+    formats = {
+        'ndjson': (export_ndjson, 'application/x-ndjson'),
+        'csv': (export_csv, 'text/csv'),
+    }
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'ndjson')
+        if export_format not in self.formats:
+            raise Http404('Неизвестный формат экспорта.')
+        export, content_type = self.formats[export_format]
+        response = StreamingHttpResponse(
+            export(self.get_queryset(), settings.NOTES_EXPORT_CHUNK_SIZE),
+            content_type=f'{content_type}; charset=utf-8',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="notes.{export_format}"'
+        )
+        return response
+
 
 class NoteDetail(NoteBase, generic.DetailView):
-    """Заметка подробно."""
+    """
+    Заметка подробно.
+
+    Ответ несёт ETag и Last-Modified по времени изменения заметки.
+    Если страница у клиента не устарела, отвечаем 304 после одного
+    запроса валидаторов, без загрузки заметки и отрисовки шаблона.
+    """
     template_name = 'notes/detail.html'
+
+    def get_validators(self):
+        """Валидаторы заметки: ETag и метка времени Last-Modified."""
+        row = self.get_queryset().filter(
+            slug=self.kwargs['slug']
+        ).values_list('pk', 'updated').first()
+        if row is None:
+            raise Http404('Заметка не найдена.')
+        pk, updated = row
+        etag = quote_etag(f'{pk}-{int(updated.timestamp() * 1_000_000)}')
+        return etag, int(updated.timestamp())
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+# Асинхронные варианты страниц для ASGI. В Django 3.2 у ORM нет
+# асинхронного интерфейса, поэтому проверка пользователя и все запросы
+# к базе выполняются за один переход в поток через sync_to_async,
+# а шаблон отрисовывается в цикле событий по уже загруженным данным.
+# Декораторы Django 3.2 с корутинами не работают, поэтому вход
+# и метод запроса проверяются вручную.
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def _notes_list_context(request):
+    if not request.user.is_authenticated:
+        return None
+    view = NotesList()
+    view.setup(request)
+    view.object_list = view.get_queryset()
+    return view.get_context_data()
+
+
+def _note_detail_context(request, slug):
+    if not request.user.is_authenticated:
+        return None
+    view = NoteDetail()
+    view.setup(request, slug=slug)
+    view.object = view.get_object()
+    return view.get_context_data(object=view.object)
+
+
+async def _render_async(request, template_name, load_context, **kwargs):
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    context = await sync_to_async(load_context)(request, **kwargs)
+    if context is None:
+        return redirect_to_login(request.get_full_path())
+    return render(request, template_name, context)
+
+
+async def notes_list_async(request):
+    """Асинхронный вариант NotesList."""
+    return await _render_async(
+        request, NotesList.template_name, _notes_list_context
+    )
+
+
+async def note_detail_async(request, slug):
+    """Асинхронный вариант NoteDetail."""
+    return await _render_async(
+        request, NoteDetail.template_name, _note_detail_context, slug=slug
+    )
@@ -0,0 +1,18 @@
+"""
+Настройки проекта по профилям.
+
+* base — общие настройки, минимальный набор приложений и слоёв;
+* dev — разработка: DEBUG, админка, сообщения, статика;
+* prod — production: кеш шаблонов, без лишних слоёв и процессоров;
+* bench — замеры производительности на отдельной базе.
+
+Профиль выбирается через DJANGO_SETTINGS_MODULE, например
+yanote.settings.prod. Сам пакет yanote.settings — это профиль dev
+без DEBUG, как прежний модуль настроек: им по умолчанию пользуются
+manage.py, wsgi.py, asgi.py и тесты, а ALLOWED_HOSTS открыт всем
+хостам, так что отладочные страницы включаются только явным выбором
+yanote.settings.dev.
+"""
+from .dev import *  # noqa: F401,F403
+
+DEBUG = False
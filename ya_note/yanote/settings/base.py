@@ -0,0 +1,166 @@
+"""
+Общие настройки всех профилей.
+
+Здесь только то, что нужно для работы сайта: без админки, сообщений
+и статики, с минимальным набором промежуточных слоёв и контекстных
+процессоров. Профили dev, prod и bench дополняют или сужают эти
+настройки.
+"""
+import os
+from pathlib import Path
+
+from django.urls import reverse_lazy
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = 'django-insecure-yipnj$#j!ajarq%k55z4kuf3x79)91h0h42o9!1ho(z=!%mt=#'
+
+DEBUG = False
+
+ALLOWED_HOSTS = ['*']
+
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'notes.apps.NotesConfig'
+]
+
+MIDDLEWARE = [
+    'yanote.middleware.PerformanceMiddleware',
+    'yanote.replicas.ReplicaRoutingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yanote.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                # request нужен шаблону notes/form.html.
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+            ],
+        },
+    },
+]
+
+# Компилировать все шаблоны из templates/ при старте процесса
+# (wsgi.py, asgi.py), см. профиль prod.
+TEMPLATES_WARM_UP = False
+
+WSGI_APPLICATION = 'yanote.wsgi.application'
+
+
+# Профиль базы данных выбирается переменной окружения DJANGO_DB_PROFILE.
+# default — SQLite с настройками по умолчанию, подключение открывается
+# заново на каждый запрос. tuned — журнал WAL (читатели не блокируют
+# писателя), ожидание блокировки вместо ошибки «database is locked»,
+# отображение файла в память, увеличенный кеш страниц и постоянные
+# подключения.
+DB_PROFILES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    'tuned': {
+        'ENGINE': 'yanote.sqlite',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'OPTIONS': {
+            'pragmas': {
+                # Первым, чтобы и переключение журнала ждало блокировку.
+                'busy_timeout': 5000,
+                'journal_mode': 'WAL',
+                # С WAL база переживает сбой целостной, теряются лишь
+                # последние транзакции; fsync на каждую не нужен.
+                'synchronous': 'NORMAL',
+                'mmap_size': 256 * 1024 * 1024,
+                # Отрицательное значение — размер в КиБ, здесь 64 МиБ.
+                'cache_size': -64 * 1024,
+            },
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+}
+DB_PROFILE = os.environ.get('DJANGO_DB_PROFILE', 'tuned')
+
+DATABASES = {
+    'default': DB_PROFILES[DB_PROFILE],
+}
+
+# Реплики только для чтения: пути к копиям файла базы через запятую
+# в DJANGO_DB_REPLICAS. Копии обновляет внешняя репликация (например,
+# Litestream); приложение только читает с них. С реплик читают страницы
+# из DATABASE_REPLICA_VIEWS, после записи клиент DATABASE_PIN_SECONDS
+# секунд читает из основной базы.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+        filter(None, os.environ.get('DJANGO_DB_REPLICAS', '').split(',')),
+        start=1
+):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['yanote.replicas.ReplicaRouter']
+DATABASE_REPLICA_VIEWS = (
+    'notes:list',
+    'notes:detail',
+    'notes:list_async',
+    'notes:detail_async',
+)
+DATABASE_PIN_SECONDS = 10
+
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+STATIC_URL = '/static/'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+LOGIN_URL = reverse_lazy('users:login')
+LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_PER_PAGE = 50
+NOTES_SEARCH_LIMIT = 50
+NOTES_IMPORT_BATCH_SIZE = 500
+NOTES_EXPORT_CHUNK_SIZE = 2000
+
+# Замер производительности запросов: заголовок Server-Timing
+# и гистограммы по маршрутам, выгружаемые в PERF_TIMING_DUMP_PATH.
+PERF_TIMING_ENABLED = os.environ.get('DJANGO_PERF_TIMING', '1') == '1'
+PERF_TIMING_DUMP_PATH = os.environ.get('DJANGO_PERF_TIMING_DUMP_PATH')
+PERF_TIMING_DUMP_INTERVAL = 60
@@ -0,0 +1,34 @@
+"""
+Настройки для production.
+
+Приложения, промежуточные слои и контекстные процессоры — только
+из base: без админки, сообщений и статики анонимное чтение страниц
+проходит через меньшее число слоёв, а процесс быстрее импортируется
+и стартует.
+
+Шаблоны загружаются кеширующим загрузчиком: каждый файл читается
+и разбирается один раз за жизнь процесса, а не на каждый запрос.
+Все шаблоны из templates/ компилируются при старте процесса,
+поэтому и первые запросы не платят за разбор.
+
+    DJANGO_SETTINGS_MODULE=yanote.settings.prod gunicorn yanote.wsgi
+"""
+from .base import *  # noqa: F401,F403
+from .base import TEMPLATES
+
+DEBUG = False
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+TEMPLATES_WARM_UP = True
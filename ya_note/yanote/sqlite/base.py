@@ -0,0 +1,41 @@
+"""
+SQLite с настройкой каждого подключения.
+
+Дополнительные ключи OPTIONS:
+
+* pragmas — словарь PRAGMA, которые выполняются сразу после открытия
+  подключения (journal_mode, synchronous, mmap_size и т. п.);
+* transaction_mode — режим BEGIN для transaction.atomic(). С IMMEDIATE
+  транзакция берёт блокировку на запись сразу и ждёт её до busy_timeout.
+  В режиме по умолчанию (DEFERRED) транзакция, которая сначала читала,
+  а потом пишет, при конкурентной записи сразу получает
+  «database is locked»: ожидание busy_timeout в этом случае не работает.
+"""
+from django.db.backends.sqlite3 import base
+from django.utils.asyncio import async_unsafe
+
+EXTRA_OPTIONS = ('pragmas', 'transaction_mode')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for option in EXTRA_OPTIONS:
+            params.pop(option, None)
+        return params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict['OPTIONS'].get('pragmas', {})
+        for name, value in pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        if mode is None:
+            super()._start_transaction_under_autocommit()
+        else:
+            self.cursor().execute(f'BEGIN {mode}')